@@ -1,4 +1,4 @@
 # config/__init__.py
-from .settings import WINDOW_CONFIG, SPECIES_CONFIG, INITIAL_POPULATION, COLORS
+from .settings import WINDOW_CONFIG, SPECIES_CONFIG, INITIAL_POPULATION, COLORS, CAPTURE_CONFIG, REPLAY_CONFIG, TELEMETRY_CONFIG, GOVERNOR_CONFIG, FRAME_BUDGET_CONFIG, PLANT_SCHEDULER_CONFIG, NEIGHBOUR_LIST_CONFIG, MEMORY_PROFILE_CONFIG, TRAIT_ANALYTICS_CONFIG
 
-__all__ = ['WINDOW_CONFIG', 'SPECIES_CONFIG', 'INITIAL_POPULATION', 'COLORS']
\ No newline at end of file
+__all__ = ['WINDOW_CONFIG', 'SPECIES_CONFIG', 'INITIAL_POPULATION', 'COLORS', 'CAPTURE_CONFIG', 'REPLAY_CONFIG', 'TELEMETRY_CONFIG', 'GOVERNOR_CONFIG', 'FRAME_BUDGET_CONFIG', 'PLANT_SCHEDULER_CONFIG', 'NEIGHBOUR_LIST_CONFIG', 'MEMORY_PROFILE_CONFIG', 'TRAIT_ANALYTICS_CONFIG']
\ No newline at end of file
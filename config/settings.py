@@ -8,6 +8,78 @@ WINDOW_CONFIG = {
     "fps": 60
 }
 
+CAPTURE_CONFIG = {
+    "enabled": False,        # 离屏录制模式（使用SDL dummy驱动，不打开窗口）
+    "output_dir": "captures",
+    "every_n_ticks": 1,      # 每N个tick采集一帧
+    "max_ticks": 3000,       # 离屏模式下运行的tick数，None表示一直运行
+    "workers": 2,            # PNG编码进程数
+    "pool_size": 4,          # 预分配的帧缓冲数量，全部占用时丢帧而不等待
+    "encoder": "png",        # "png" 输出PNG序列，"ffmpeg" 通过管道交给本地ffmpeg
+    "ffmpeg_path": "ffmpeg",
+    "fps": 30,               # 输出视频的帧率
+}
+
+REPLAY_CONFIG = {
+    "seed": None,                            # 随机种子，None表示每次运行随机选取
+    "record_path": "replays/last_run.json",  # 退出时保存输入回放日志，None表示不保存
+}
+
+TELEMETRY_CONFIG = {
+    "enabled": False,          # 本地遥测服务（换行分隔的JSON，TCP；也支持HTTP GET获取最新快照）
+    "host": "127.0.0.1",       # 只监听本机
+    "port": 8765,
+    "rate": 5,                 # 每秒推送快照次数
+    "client_queue_size": 4,    # 每个客户端最多积压的快照数，超出时丢弃最旧的
+    "command_queue_size": 64,  # 待处理控制命令上限
+    "max_speed": 10,           # speed命令允许的每帧最大tick数
+}
+
+GOVERNOR_CONFIG = {
+    "enabled": True,            # 种群调控：超出容量时抑制繁殖和新增生物
+    "max_population": 1500,     # 全局种群上限
+    "memory_budget_mb": 64,     # 生物对象的内存预算
+    "bytes_per_organism": 512,  # 每个生物的估计内存（tracemalloc实测约380字节，留有余量）
+    "soft_limit": 0.8,          # 达到上限的80%后开始按比例降低繁殖概率
+}
+
+FRAME_BUDGET_CONFIG = {
+    "enabled": True,        # 帧时间预算：超预算时依次关闭粒子、浮动动画、跳帧渲染、植物聚合绘制
+    "degrade_ratio": 1.0,   # 平均帧耗时超过预算的该倍数时降级
+    "recover_ratio": 0.6,   # 平均帧耗时低于预算的该倍数时恢复
+    "degrade_frames": 15,   # 连续超预算多少帧后降一级
+    "recover_frames": 90,   # 连续有余量多少帧后升一级
+    "smoothing": 0.1,       # 帧耗时指数平滑系数
+    "render_every": 2,      # 跳帧等级下每N帧渲染一次
+}
+
+PLANT_SCHEDULER_CONFIG = {
+    "enabled": False,    # 事件驱动模式：植物只在事件（繁殖、死亡、换季）或邻居变化时更新
+    "max_interval": 100, # 两次更新之间最多间隔的tick数，限制近似误差
+}
+
+NEIGHBOUR_LIST_CONFIG = {
+    "enabled": True,     # 跨tick复用邻居表（竞争、求偶、捕食共用）
+    "skin": 10,          # 邻居表在相互作用范围外多保留的距离；越大重建越少，但表越长
+    "max_neighbours": 400,    # 周围网格内超过这么多个体的动物不再缓存邻居表，改为每次直接扫描网格
+    "max_competitors": 1000,  # 植物竞争计数的上限：每个竞争者每tick消耗0.1能量，超过1000个时能量必然一tick归零
+}
+
+MEMORY_PROFILE_CONFIG = {
+    "enabled": False,                          # 内存分析（tracemalloc + gc回调），会明显降低运行速度
+    "export_path": "profiles/memory.jsonl",    # 每条记录一行JSON，None表示不导出
+    "frames": 1,                               # tracemalloc 保存的调用栈深度
+    "sample_every": 1,                         # 每N个tick记录一次
+    "snapshot_every": 300,                     # 每N个tick做一次快照，统计热点和每个生物的内存
+    "top_sites": 10,                           # 快照中保留的分配热点数量
+}
+
+TRAIT_ANALYTICS_CONFIG = {
+    "histogram_range": (0.5, 1.5),  # 基因性状直方图的取值范围，超出部分计入溢出计数
+    "histogram_bins": 20,
+    "relative_accuracy": 0.01,      # 分位数草图的相对误差
+}
+
 COLORS = {
     "background": (255, 255, 255),
     "text": (0, 0, 0),
@@ -27,6 +99,7 @@ SPECIES_CONFIG = {
         "mutation_chance": 0.1,
         "min_reproduction_energy": 60,   # 降低繁殖能量要求
         "competition_radius": 50,        # 添加竞争范围
+        "carrying_capacity": 400,        # 种群上限
     },
     "Grass": {
         "color": (124, 252, 0),
@@ -39,6 +112,7 @@ SPECIES_CONFIG = {
         "mutation_chance": 0.1,
         "min_reproduction_energy": 50,   # 降低繁殖能量要求
         "competition_radius": 30,        # 添加竞争范围
+        "carrying_capacity": 800,        # 种群上限
     },
     "Rabbit": {
         "color": (169, 169, 169),  # 灰色
@@ -50,6 +124,7 @@ SPECIES_CONFIG = {
         "reproduction_rate": 0.006,  # 增加繁殖率
         "mutation_chance": 0.1,
         "min_reproduction_energy": 65,  # 降低繁殖能量要求
+        "carrying_capacity": 200,  # 种群上限
     },
     "Deer": {
         "color": (139, 69, 19),  # 棕色
@@ -61,6 +136,7 @@ SPECIES_CONFIG = {
         "reproduction_rate": 0.004,  # 增加繁殖率
         "mutation_chance": 0.1,
         "min_reproduction_energy": 70,  # 降低繁殖能量要求
+        "carrying_capacity": 120,  # 种群上限
     },
     "Wolf": {
         "color": (128, 0, 0),  # 深红色
@@ -72,6 +148,7 @@ SPECIES_CONFIG = {
         "reproduction_rate": 0.003,  # 增加繁殖率
         "mutation_chance": 0.1,
         "min_reproduction_energy": 75,  # 降低繁殖能量要求
+        "carrying_capacity": 60,  # 种群上限
     }
 }
 
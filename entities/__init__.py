@@ -1,3 +1,4 @@
 # entities/__init__.py
 from .environment import Environment, Weather, Season
-from .organism import Organism, Genetics
\ No newline at end of file
+from .organism import Organism, Genetics
+from .random_streams import RandomStreams
\ No newline at end of file
@@ -25,7 +25,10 @@ class EnvironmentalFactors:
     pollution: float = 0.0  # 添加污染属性，默认值为0
 
 class Environment:
-    def __init__(self):
+    SEASON_LENGTH = 1000  # 每个季节持续的时间单位
+
+    def __init__(self, rng=None):
+        self.rng = rng if rng is not None else random.Random()  # 天气随机数流
         self.season = Season.SPRING
         self.weather = Weather.SUNNY
         self.time = 0
@@ -44,15 +47,35 @@ class Environment:
 
     def _update_season(self):
         # 每1000个时间单位更换季节
-        if self.time % 1000 == 0:
+        if self.time % self.SEASON_LENGTH == 0:
             seasons = list(Season)
             current_idx = seasons.index(self.season)
             self.season = seasons[(current_idx + 1) % len(seasons)]
 
+    def ticks_until_season_change(self):
+        return self.SEASON_LENGTH - self.time % self.SEASON_LENGTH
+
+    def plant_energy_gain(self):
+        # 植物每个时间单位从环境获得的能量（与具体植物无关）
+        energy_gain = (
+            self.factors.sunlight * 0.5 +
+            self.factors.water_level * 0.3 +
+            (1 - self.factors.humidity) * 0.2  # 改用humidity代替pollution
+        )
+
+        # 根据季节调整能量获取
+        if self.season == Season.WINTER:
+            energy_gain *= 0.3
+        elif self.season == Season.FALL:
+            energy_gain *= 0.7
+        elif self.season == Season.SPRING:
+            energy_gain *= 1.2
+        return energy_gain
+
     def _update_weather(self):
         # 2%的概率改变天气
-        if random.random() < 0.02:
-            self.weather = random.choice(list(Weather))
+        if self.rng.random() < 0.02:
+            self.weather = self.rng.choice(list(Weather))
 
     def _update_factors(self):
         # 根据季节和天气更新环境因素
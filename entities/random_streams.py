@@ -0,0 +1,25 @@
+# entities/random_streams.py
+import random
+
+
+class RandomStreams:
+    """One master seed, split into an independent random.Random per subsystem.
+
+    Each stream is seeded from "<seed>:<name>", so adding draws to one
+    subsystem never shifts the sequence seen by another.
+    """
+
+    def __init__(self, seed=None):
+        if seed is None:
+            # Pick a seed anyway so that every run can be replayed
+            seed = random.SystemRandom().randrange(2 ** 32)
+        self.seed = seed
+        self.spawn = self.derive("spawn")
+        self.genetics = self.derive("genetics")
+        self.movement = self.derive("movement")
+        self.reproduction = self.derive("reproduction")
+        self.weather = self.derive("weather")
+        self.input = self.derive("input")
+
+    def derive(self, name):
+        return random.Random(f"{self.seed}:{name}")
@@ -1,29 +1,76 @@
 # main.py
-import random
+import argparse
+import os
 import pygame
 import sys
-from config import WINDOW_CONFIG, SPECIES_CONFIG, INITIAL_POPULATION, COLORS
+import time
+from config import WINDOW_CONFIG, SPECIES_CONFIG, INITIAL_POPULATION, COLORS, CAPTURE_CONFIG, REPLAY_CONFIG, TELEMETRY_CONFIG, GOVERNOR_CONFIG, FRAME_BUDGET_CONFIG, PLANT_SCHEDULER_CONFIG, NEIGHBOUR_LIST_CONFIG, MEMORY_PROFILE_CONFIG, TRAIT_ANALYTICS_CONFIG
 from simulation.ecosystem import Ecosystem
+from simulation.replay import ReplayLog, replay
+from simulation.scenario import Scenario
+from simulation.telemetry import TelemetryServer
+from simulation.trait_analytics import TRAITS
 from visualization.renderer import Renderer
+from visualization.capture import FrameCapture
+from visualization.frame_budget import FrameBudgetScheduler
 
 class Application:
-    def __init__(self):
+    def __init__(self, offscreen=False, seed=None, replay_log=None, render=True, telemetry=False,
+                 profile_memory=False, scenario=None):
+        self.offscreen = offscreen
+        self.replay_log = replay_log
+        self.render_enabled = render
+        if self.offscreen or not self.render_enabled:
+            # 离屏录制或无渲染回放：使用SDL dummy驱动，不打开真实窗口
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
         pygame.init()
         self.screen = pygame.display.set_mode((WINDOW_CONFIG["width"], WINDOW_CONFIG["height"]))
         pygame.display.set_caption(WINDOW_CONFIG["title"])
         self.clock = pygame.time.Clock()
+
+        # 回放时使用录制时的场景文件
+        if replay_log and replay_log.scenario:
+            scenario = Scenario.load(replay_log.scenario)
+        if replay_log:
+            seed = replay_log.seed
+        elif scenario and seed is None:
+            seed = scenario.seed
         
         self.ecosystem = Ecosystem({
             "WINDOW_CONFIG": WINDOW_CONFIG,
-            "SPECIES_CONFIG": SPECIES_CONFIG,
-            "INITIAL_POPULATION": INITIAL_POPULATION
-        })
+            "SPECIES_CONFIG": scenario.species_config(SPECIES_CONFIG) if scenario else SPECIES_CONFIG,
+            "INITIAL_POPULATION": {} if scenario else INITIAL_POPULATION,
+            "GOVERNOR_CONFIG": scenario.governor_config(GOVERNOR_CONFIG) if scenario else GOVERNOR_CONFIG,
+            "PLANT_SCHEDULER_CONFIG": PLANT_SCHEDULER_CONFIG,
+            "NEIGHBOUR_LIST_CONFIG": NEIGHBOUR_LIST_CONFIG,
+            "MEMORY_PROFILE_CONFIG": dict(MEMORY_PROFILE_CONFIG, enabled=profile_memory or MEMORY_PROFILE_CONFIG["enabled"]),
+            "TRAIT_ANALYTICS_CONFIG": TRAIT_ANALYTICS_CONFIG
+        }, seed=seed)
+        if scenario:
+            scenario.apply(self.ecosystem)
+            self.ecosystem.replay_log.scenario = scenario.path
         
         self.renderer = Renderer(self.screen, {
             "WINDOW_CONFIG": WINDOW_CONFIG,
             "COLORS": COLORS
-        })
+        }, seed=self.ecosystem.rng.seed)
         self.running = True
+        self.tick = 0
+        self.speed = 1  # 每帧推进的tick数
+        self.render_time = 0.0
+        self.frame_budget = FrameBudgetScheduler(WINDOW_CONFIG["fps"], FRAME_BUDGET_CONFIG)
+
+        self.capture = None
+        if self.offscreen:
+            self.capture = FrameCapture(
+                (WINDOW_CONFIG["width"], WINDOW_CONFIG["height"]),
+                CAPTURE_CONFIG
+            )
+
+        self.telemetry = None
+        if telemetry:
+            self.telemetry = TelemetryServer(TELEMETRY_CONFIG, self.ecosystem.config["SPECIES_CONFIG"])
+            self.telemetry.start()
 
     def handle_events(self):
         for event in pygame.event.get():
@@ -37,46 +84,149 @@ class Application:
    # main.py 中的增强版按键控制
     def handle_keypress(self, key):
         if key == pygame.K_SPACE:
-            self.ecosystem.toggle_pause()  # 暂停/继续
+            self.ecosystem.apply_input("pause")  # 暂停/继续
         elif key == pygame.K_ESCAPE:
             self.running = False    # 退出
+        elif key == pygame.K_t:
+            # 依次切换基因性状分布面板：关闭 -> 各性状 -> 关闭
+            options = (None,) + TRAITS
+            index = options.index(self.renderer.trait_panel)
+            self.renderer.trait_panel = options[(index + 1) % len(options)]
         elif key == pygame.K_1:
             # 添加树
             x, y = pygame.mouse.get_pos()
-            self.ecosystem.add_organism("Tree", x, y)
+            self.ecosystem.apply_input("spawn", "Tree", x, y)
         elif key == pygame.K_2:
             # 添加草
             x, y = pygame.mouse.get_pos()
-            self.ecosystem.add_organism("Grass", x, y)
+            self.ecosystem.apply_input("spawn", "Grass", x, y)
         elif key == pygame.K_3:
             # 添加兔子
             x, y = pygame.mouse.get_pos()
-            self.ecosystem.add_organism("Rabbit", x, y)
+            self.ecosystem.apply_input("spawn", "Rabbit", x, y)
         elif key == pygame.K_4:
             # 添加鹿
             x, y = pygame.mouse.get_pos()
-            self.ecosystem.add_organism("Deer", x, y)
+            self.ecosystem.apply_input("spawn", "Deer", x, y)
         elif key == pygame.K_5:
             # 添加狼
             x, y = pygame.mouse.get_pos()
-            self.ecosystem.add_organism("Wolf", x, y)
+            self.ecosystem.apply_input("spawn", "Wolf", x, y)
 
     def handle_mouse_click(self, event):
         x, y = event.pos
         # 随机添加一种生物
-        species_name = random.choice(list(SPECIES_CONFIG.keys()))
-        self.ecosystem.add_organism(species_name, x, y)
+        species_name = self.ecosystem.rng.input.choice(list(self.ecosystem.config["SPECIES_CONFIG"].keys()))
+        self.ecosystem.apply_input("spawn", species_name, x, y)
+
+    def handle_telemetry(self):
+        # 执行远程控制命令，并按配置的频率推送状态
+        for command in self.telemetry.drain_commands():
+            if command["cmd"] == "pause":
+                self.ecosystem.apply_input("pause")
+            elif command["cmd"] == "speed":
+                self.speed = max(1, min(TELEMETRY_CONFIG["max_speed"], int(command["value"])))
+            elif command["cmd"] == "spawn":
+                self.ecosystem.apply_input("spawn", command["species"], command.get("x"), command.get("y"))
+        self.telemetry.publish(self.ecosystem, {"render": self.render_time})
 
     def run(self):
-        while self.running:
-            self.handle_events()
-            self.ecosystem.update()
-            self.renderer.render(self.ecosystem)
-            self.clock.tick(WINDOW_CONFIG["fps"])
+        if self.replay_log:
+            self.run_replay()
+        elif self.offscreen:
+            self.run_offscreen()
+        else:
+            while self.running:
+                frame_start = time.perf_counter()
+                self.handle_events()
+                if self.telemetry:
+                    self.handle_telemetry()
+                for _ in range(self.speed):
+                    self.ecosystem.update()
+                self.tick += 1
+                # 超出帧预算时按顺序降低渲染细节，必要时跳过整帧渲染
+                if self.frame_budget.should_render():
+                    self.renderer.detail_level = self.frame_budget.level
+                    self.render_frame()
+                self.frame_budget.record((time.perf_counter() - frame_start) * 1000)
+                self.clock.tick(WINDOW_CONFIG["fps"])
+
+        if self.telemetry:
+            self.telemetry.stop()
+        if self.ecosystem.memory_profiler:
+            self.ecosystem.memory_profiler.close()
+
+        if not self.replay_log and REPLAY_CONFIG["record_path"]:
+            self.ecosystem.save_replay(REPLAY_CONFIG["record_path"])
+            print(f"Replay saved to {REPLAY_CONFIG['record_path']} (seed {self.ecosystem.rng.seed})")
 
         pygame.quit()
         sys.exit()
 
+    def render_frame(self, target=None):
+        # 渲染一帧，并把渲染阶段计入耗时和内存统计
+        profiler = self.ecosystem.memory_profiler
+        start = time.perf_counter()
+        if profiler:
+            profiler.begin_phase("render")
+        self.renderer.render(self.ecosystem, target)
+        if profiler:
+            profiler.end_phase("render")
+        self.render_time = (time.perf_counter() - start) * 1000
+
+    def run_offscreen(self):
+        # 离屏模式不限帧率；只在需要采集的tick渲染，缓冲池耗尽时丢帧而不是等待编码
+        max_ticks = CAPTURE_CONFIG["max_ticks"]
+        try:
+            while self.running and (max_ticks is None or self.tick < max_ticks):
+                if self.telemetry:
+                    self.handle_telemetry()
+                self.ecosystem.update()
+                self.tick += 1
+                if self.capture.wants(self.tick):
+                    self.capture_frame()
+        finally:
+            self.capture.close()
+
+    def capture_frame(self):
+        # 帧缓冲建在共享内存上，这里不留引用，capture.close() 时才能解除映射
+        frame = self.capture.acquire()
+        if frame is not None:
+            self.render_frame(frame)
+            self.capture.submit(frame, self.tick)
+
+    def run_replay(self):
+        # 按回放日志重建一次运行；关闭渲染时以最快速度运行
+        def on_tick(ecosystem):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    return False
+            self.render_frame()
+            self.clock.tick(WINDOW_CONFIG["fps"])
+
+        replay(self.ecosystem, self.replay_log, on_tick if self.render_enabled else None)
+        print(f"Replayed {self.ecosystem.tick} ticks, {len(self.ecosystem.organisms)} organisms alive")
+
 if __name__ == "__main__":
-    app = Application()
+    parser = argparse.ArgumentParser(description=WINDOW_CONFIG["title"])
+    parser.add_argument("--capture", action="store_true", help="离屏录制帧到 CAPTURE_CONFIG['output_dir']")
+    parser.add_argument("--seed", type=int, default=REPLAY_CONFIG["seed"], help="随机种子")
+    parser.add_argument("--replay", metavar="PATH", help="按回放日志重建一次运行")
+    parser.add_argument("--scenario", metavar="PATH", help="从场景文件加载物种配置、环境和初始种群")
+    parser.add_argument("--no-render", action="store_true", help="回放时不渲染，以最快速度运行")
+    parser.add_argument("--telemetry", action="store_true", help="启动本地遥测服务")
+    parser.add_argument("--profile-memory", action="store_true", help="记录每个tick各阶段的内存分配和GC情况")
+    args = parser.parse_args()
+    if args.no_render and not args.replay:
+        parser.error("--no-render 只能与 --replay 一起使用")
+
+    app = Application(
+        offscreen=args.capture or CAPTURE_CONFIG["enabled"],
+        seed=args.seed,
+        replay_log=ReplayLog.load(args.replay) if args.replay else None,
+        render=not args.no_render,
+        telemetry=args.telemetry or TELEMETRY_CONFIG["enabled"],
+        profile_memory=args.profile_memory,
+        scenario=Scenario.load(args.scenario) if args.scenario else None
+    )
     app.run()
\ No newline at end of file
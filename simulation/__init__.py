@@ -1,4 +1,12 @@
 # simulation/__init__.py
 from .ecosystem import Ecosystem
+from .replay import ReplayLog, replay
+from .telemetry import TelemetryServer
+from .governor import PopulationGovernor
+from .plant_scheduler import PlantScheduler
+from .neighbours import NeighbourList
+from .memory_profiler import MemoryProfiler
+from .trait_analytics import TraitAnalytics
+from .scenario import Scenario
 
-__all__ = ['Ecosystem']
\ No newline at end of file
+__all__ = ['Ecosystem', 'ReplayLog', 'replay', 'TelemetryServer', 'PopulationGovernor', 'PlantScheduler', 'NeighbourList', 'MemoryProfiler', 'TraitAnalytics', 'Scenario']
\ No newline at end of file
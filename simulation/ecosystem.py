@@ -1,31 +1,196 @@
 # simulation/ecosystem.py
-import random
+import gc
+import time
 from typing import List, Dict
-from entities import Environment, Organism
+import numpy as np
+from entities import Environment, Organism, Genetics, RandomStreams
+from entities.organism import MATING_RANGE
+from .replay import ReplayLog
+from .governor import PopulationGovernor
+from .plant_scheduler import PlantScheduler
+from .neighbours import NeighbourList
+from .memory_profiler import MemoryProfiler
+from .trait_analytics import TraitAnalytics, TRAITS
+
+PREDATION_RANGE = 20  # Animals eat the nearest valid prey within this distance
 
 class Ecosystem:
-    def __init__(self, config):
+    def __init__(self, config, seed=None):
         self.config = config
-        self.environment = Environment()
+        # Every subsystem draws from its own stream so runs are reproducible
+        self.rng = RandomStreams(seed)
+        self.environment = Environment(self.rng.weather)
         self.organisms = []
         self.statistics = {"plants": [], "herbivores": [], "carnivores": []}
         self.paused = False
+        self.tick = 0
+        # Wall time of each update phase in milliseconds, for monitoring
+        self.phase_timings = {"environment": 0.0, "organisms": 0.0, "interactions": 0.0, "statistics": 0.0}
+        self.replay_log = ReplayLog(self.rng.seed)
+        self.governor = PopulationGovernor(
+            self.config.get("GOVERNOR_CONFIG", PopulationGovernor.DISABLED_CONFIG),
+            self.config["SPECIES_CONFIG"]
+        )
+
+        # Streaming per-species genetic trait distributions
+        self.traits = TraitAnalytics(
+            self.config.get("TRAIT_ANALYTICS_CONFIG", TraitAnalytics.DEFAULT_CONFIG),
+            self.config["SPECIES_CONFIG"].keys()
+        )
+
+        # Neighbour lists reused across ticks; without them every query scans all organisms
+        self.neighbours = None
+        neighbour_config = self.config.get("NEIGHBOUR_LIST_CONFIG")
+        if neighbour_config and neighbour_config["enabled"]:
+            self.neighbours = NeighbourList(
+                neighbour_config, self.config["SPECIES_CONFIG"], MATING_RANGE, PREDATION_RANGE
+            )
+
+        # Optional event-driven mode: plants are only updated when an event fires
+        self.plant_scheduler = None
+        scheduler_config = self.config.get("PLANT_SCHEDULER_CONFIG")
+        if scheduler_config and scheduler_config["enabled"]:
+            self.plant_scheduler = PlantScheduler(
+                scheduler_config, self.config["SPECIES_CONFIG"], self.rng.reproduction, self.neighbours
+            )
+
+        # Optional allocation/GC instrumentation (slows the simulation down noticeably)
+        self.memory_profiler = None
+        profile_config = self.config.get("MEMORY_PROFILE_CONFIG")
+        if profile_config and profile_config["enabled"]:
+            self.memory_profiler = MemoryProfiler(profile_config)
+
+        self._phases = [
+            ("environment", self._update_environment),
+            ("organisms", self._update_organisms),
+            ("interactions", self._handle_interactions),
+            ("statistics", self._collect_statistics)
+        ]
         
         # Define ground height
         self.ground_height = self.config["WINDOW_CONFIG"]["height"] * 0.7  # Ground is at 70% of the window height
         self.initialize_population()
 
     def initialize_population(self):
-        for species_name, count in self.config["INITIAL_POPULATION"].items():
-            for _ in range(count):
-                self.add_organism(species_name)
+        if self.config["INITIAL_POPULATION"]:
+            self.populate(self.config["INITIAL_POPULATION"])
+
+    def _bulk_rng(self):
+        # A numpy generator seeded from the spawn stream keeps bulk spawns reproducible
+        return np.random.default_rng(self.rng.spawn.getrandbits(64))
+
+    def placements(self, populations):
+        """Random positions for `populations` ({species name: count}), using the same rules as add_organism.
+
+        Returns a list of species names and the matching x and y arrays.
+        """
+        generator = self._bulk_rng()
+        names, xs, ys = [], [], []
+        for species_name, count in populations.items():
+            species_config = self.config["SPECIES_CONFIG"][species_name]
+            names.extend([species_name] * count)
+            xs.append(generator.uniform(0, self.config["WINDOW_CONFIG"]["width"], count))
+            if species_config["diet"] == "Plant":
+                ys.append(np.full(count, self.ground_height))
+            else:
+                ys.append(generator.uniform(self.ground_height - 50, self.ground_height, count))
+        return names, np.concatenate(xs or [[]]), np.concatenate(ys or [[]])
+
+    def populate(self, populations):
+        """Spawn organisms at random positions for each {species name: count} in one bulk pass."""
+        return self.spawn_bulk(*self.placements(populations))
+
+    def spawn_bulk(self, species, xs, ys, genetics=None):
+        """Insert many organisms in one pass.
+
+        `species` is a species name or a sequence with one name per organism,
+        `xs`/`ys` are coordinate arrays, and `genetics` optionally maps trait
+        names to arrays (traits left out, or NaN entries, are rolled as in
+        Organism). Sequences of any other length than `xs` raise ValueError. Spawning everything in one call is much cheaper than
+        several calls, since the neighbour lists are rebuilt once. Unlike
+        add_organism, nothing is throttled probabilistically: organisms beyond
+        the governor's hard limits are refused. Returns the new organisms.
+        """
+        start = time.perf_counter()
+        xs = np.clip(np.asarray(xs, dtype=float), 0, self.config["WINDOW_CONFIG"]["width"])
+        ys = np.clip(np.asarray(ys, dtype=float), 0, self.config["WINDOW_CONFIG"]["height"])
+        count = len(xs)
+        if len(ys) != count:
+            raise ValueError("xs and ys must have the same length")
+        if isinstance(species, str):
+            names = np.full(count, species, dtype=object)
+        else:
+            names = np.asarray(species, dtype=object)
+            if len(names) != count:
+                raise ValueError(f"Got {len(names)} species names for {count} organisms")
+
+        genetics = dict(genetics or {})
+        for trait, values in genetics.items():
+            if len(values) != count:
+                raise ValueError(f"Got {len(values)} {trait} values for {count} organisms")
+        generator = self._bulk_rng()
+        for trait in TRAITS:
+            rolled = generator.uniform(0.8, 1.2, count)
+            if trait in genetics:
+                values = np.asarray(genetics[trait], dtype=float)
+                genetics[trait] = np.where(np.isnan(values), rolled, values)
+            else:
+                genetics[trait] = rolled
+
+        # Everything allocated here stays alive, so collections during the build are wasted work
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            spawned = []
+            for species_name in dict.fromkeys(names.tolist()):
+                species_config = self.config["SPECIES_CONFIG"][species_name]
+                indices = np.flatnonzero(names == species_name)
+                allowed = self.governor.headroom(species_name)
+                if len(indices) > allowed:
+                    self.governor.refuse(species_name, len(indices) - allowed)
+                    indices = indices[:allowed]
+                if len(indices) == 0:
+                    continue
+
+                columns = {trait: genetics[trait][indices] for trait in TRAITS}
+                if self.memory_profiler:
+                    self.memory_profiler.begin_spawn()
+                organisms = [
+                    Organism(x, y, species_config, self.config, self.rng, species_name,
+                             Genetics(*traits), verbose=False)
+                    for x, y, *traits in zip(xs[indices].tolist(), ys[indices].tolist(),
+                                             *(columns[trait].tolist() for trait in TRAITS))
+                ]
+                if self.memory_profiler:
+                    self.memory_profiler.end_spawn(len(organisms))
+                self.organisms.extend(organisms)
+                self.governor.added(species_name, len(organisms))
+                self.traits.added_many(species_name, columns)
+                spawned.extend(organisms)
+
+            if self.neighbours:
+                self.neighbours.add_many(spawned)
+            if self.plant_scheduler:
+                self.plant_scheduler.add_many(
+                    [organism for organism in spawned if organism.species_config["diet"] == "Plant"], self.tick
+                )
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+        print(f"Spawned {len(spawned)} organisms in {(time.perf_counter() - start) * 1000:.0f} ms")
+        return spawned
 
     def add_organism(self, species_name, x=None, y=None):
         species_config = self.config["SPECIES_CONFIG"][species_name]
+
+        # Refuse (or probabilistically throttle) new organisms near the limits
+        if not self.governor.admit(species_name, self.rng.spawn):
+            return None
         
         # Randomly generate position if not specified
         if x is None:
-            x = random.uniform(0, self.config["WINDOW_CONFIG"]["width"])
+            x = self.rng.spawn.uniform(0, self.config["WINDOW_CONFIG"]["width"])
             
         # Determine y-coordinate based on organism type
         if y is None:
@@ -34,7 +199,7 @@ class Ecosystem:
                 y = self.ground_height
             else:
                 # Animals are generated slightly above the ground
-                y = random.uniform(
+                y = self.rng.spawn.uniform(
                     self.ground_height - 50,  # Slightly above ground
                     self.ground_height        # Ground level
                 )
@@ -43,32 +208,96 @@ class Ecosystem:
         x = max(0, min(x, self.config["WINDOW_CONFIG"]["width"]))
         y = max(0, min(y, self.config["WINDOW_CONFIG"]["height"]))
         
-        organism = Organism(x, y, species_config, self.config)  # Pass config
+        organism = Organism(x, y, species_config, self.config, self.rng, species_name)  # Pass config
+        self._insert_organism(organism)
+        return organism
+
+    def _insert_organism(self, organism):
         self.organisms.append(organism)
+        self.governor.added(organism.species_name)
+        self.traits.added(organism)
+        # The scheduler reads competitor counts from the neighbour list, so that goes first
+        if self.neighbours:
+            self.neighbours.add(organism)
+        if self.plant_scheduler and organism.species_config["diet"] == "Plant":
+            self.plant_scheduler.add(organism, self.tick)
+
+    def _remove_organism(self, organism):
+        self.organisms.remove(organism)
+        self.governor.removed(organism.species_name)
+        self.traits.removed(organism)
+        if self.neighbours:
+            self.neighbours.remove(organism)
+        if self.plant_scheduler and organism.species_config["diet"] == "Plant":
+            self.plant_scheduler.remove(organism, self.tick)
 
     def update(self):
         if self.paused:
             return
 
+        self.tick += 1
+        profiler = self.memory_profiler
+        if profiler:
+            profiler.start_tick(self.tick, self.organisms)
+
+        for name, phase in self._phases:
+            start = time.perf_counter()
+            if profiler:
+                profiler.begin_phase(name)
+            phase()
+            if profiler:
+                profiler.end_phase(name)
+            self.phase_timings[name] = (time.perf_counter() - start) * 1000
+
+    def _update_environment(self):
         self.environment.update()
-        self._update_organisms()
-        self._handle_interactions()
-        self._collect_statistics()
+        if self.plant_scheduler:
+            self.plant_scheduler.record(self.tick, self.environment)
 
     def _update_organisms(self):
         # Update existing organisms
         for organism in self.organisms[:]:  # Use slicing to create a copy to avoid modifying the list during iteration
-            organism.update(self.environment, self.organisms)
+            if self.plant_scheduler and organism.species_config["diet"] == "Plant":
+                continue  # Updated by _update_scheduled_plants when an event fires
+
+            if self.neighbours:
+                organism.update(self.environment, self.neighbours.of(organism),
+                                self.neighbours.competitors(organism))
+                self.neighbours.moved(organism)
+            else:
+                organism.update(self.environment, self.organisms)
             
             # Handle death
             if organism.health <= 0 or organism.energy <= 0:
-                self.organisms.remove(organism)
+                self._remove_organism(organism)
                 continue
             
-            # Handle reproduction
-            offspring = organism.reproduce()
+            # Handle reproduction; the governor only weighs in on births that would happen
+            if not organism.can_reproduce():
+                continue
+            if not self.governor.admit(organism.species_name, self.rng.reproduction):
+                continue
+            offspring = organism.reproduce(roll=False)
             if offspring:
-                self.organisms.append(offspring)
+                self._insert_organism(offspring)
+
+        if self.plant_scheduler:
+            self._update_scheduled_plants()
+
+    def _update_scheduled_plants(self):
+        for plant in self.plant_scheduler.pop_due(self.tick):
+            if plant.health <= 0 or plant.energy <= 0:
+                self._remove_organism(plant)
+                continue
+
+            # The scheduler already drew the reproduction chance as a waiting time
+            if (self.plant_scheduler.reproduction_due(plant, self.tick) and
+                    plant.can_reproduce(roll=False) and
+                    self.governor.admit(plant.species_name, self.rng.reproduction)):
+                offspring = plant.reproduce(roll=False)
+                if offspring:
+                    self._insert_organism(offspring)
+            self.plant_scheduler.schedule(plant, self.tick)
 
     def _handle_interactions(self):
         for org in self.organisms:
@@ -79,7 +308,8 @@ class Ecosystem:
             nearest_prey = None
             min_distance = float('inf')
             
-            for potential_prey in self.organisms:
+            candidates = self.neighbours.of(org) if self.neighbours else self.organisms
+            for potential_prey in candidates:
                 if self._is_valid_prey(org, potential_prey):
                     distance = ((org.x - potential_prey.x) ** 2 + 
                               (org.y - potential_prey.y) ** 2) ** 0.5
@@ -88,9 +318,9 @@ class Ecosystem:
                         nearest_prey = potential_prey
 
             # Prey if close enough
-            if nearest_prey and min_distance < 20:
+            if nearest_prey and min_distance < PREDATION_RANGE:
                 org.energy = min(100, org.energy + 30)
-                self.organisms.remove(nearest_prey)
+                self._remove_organism(nearest_prey)
 
     def _is_valid_prey(self, predator, prey):
         if predator.species_config["diet"] == "Herbivore":
@@ -115,5 +345,27 @@ class Ecosystem:
             if len(self.statistics[category]) > 100:
                 self.statistics[category].pop(0)
 
+    def get_trait_statistics(self, histograms=True):
+        """Per-species trait mean, std, quantiles and histograms, plus births and deaths."""
+        return self.traits.summary(histograms)
+
     def toggle_pause(self):
-        self.paused = not self.paused
\ No newline at end of file
+        self.paused = not self.paused
+
+    def apply_input(self, kind, *args):
+        """Apply a user input and record it in the replay log.
+
+        Supported inputs are ("spawn", species_name, x, y) and ("pause",).
+        """
+        if kind == "spawn":
+            species_name, x, y = args
+            self.add_organism(species_name, x, y)
+        elif kind == "pause":
+            self.toggle_pause()
+        else:
+            raise ValueError(f"Unknown input: {kind}")
+        self.replay_log.record(self.tick, kind, *args)
+
+    def save_replay(self, path):
+        self.replay_log.ticks = self.tick
+        self.replay_log.save(path)
\ No newline at end of file
@@ -0,0 +1,111 @@
+# simulation/governor.py
+import math
+from collections import Counter
+
+
+class PopulationGovernor:
+    """Keeps the population within carrying capacities and a memory budget.
+
+    Pressure is the highest of three ratios: total population against
+    `max_population`, a species' count against its `carrying_capacity`, and
+    the estimated memory use against `memory_budget_mb`. Below `soft_limit`
+    everything is admitted; between `soft_limit` and 1.0 the admission
+    probability falls linearly to zero, and at 1.0 nothing is admitted.
+    """
+
+    # Used when the ecosystem config has no GOVERNOR_CONFIG: count, never throttle
+    DISABLED_CONFIG = {
+        "enabled": False,
+        "max_population": 1,
+        "memory_budget_mb": 1,
+        "bytes_per_organism": 0,
+        "soft_limit": 1.0
+    }
+
+    def __init__(self, governor_config, species_config):
+        self.enabled = governor_config["enabled"]
+        self.max_population = governor_config["max_population"]
+        self.memory_budget = governor_config["memory_budget_mb"] * 1024 * 1024
+        self.bytes_per_organism = governor_config["bytes_per_organism"]
+        self.soft_limit = governor_config["soft_limit"]
+        self.capacity = {
+            name: config.get("carrying_capacity")
+            for name, config in species_config.items()
+        }
+
+        self.counts = Counter()
+        self.total = 0
+        self.throttled = Counter()  # species -> rejected births/spawns
+        self._limits_hit = set()
+
+    def added(self, species_name, count=1):
+        self.counts[species_name] += count
+        self.total += count
+
+    def removed(self, species_name):
+        self.counts[species_name] -= 1
+        self.total -= 1
+
+    def estimated_bytes(self):
+        return self.total * self.bytes_per_organism
+
+    def _pressures(self, species_name):
+        pressures = {
+            "population": self.total / self.max_population,
+            "memory": self.estimated_bytes() / self.memory_budget
+        }
+        capacity = self.capacity.get(species_name)
+        if capacity:
+            pressures[species_name] = self.counts[species_name] / capacity
+        return pressures
+
+    def headroom(self, species_name):
+        """How many more `species_name` organisms fit before a hard limit is reached."""
+        if not self.enabled:
+            return math.inf
+        limits = [self.max_population - self.total]
+        if self.bytes_per_organism:
+            limits.append((self.memory_budget - self.estimated_bytes()) // self.bytes_per_organism)
+        capacity = self.capacity.get(species_name)
+        if capacity:
+            limits.append(capacity - self.counts[species_name])
+        return max(0, int(min(limits)))
+
+    def refuse(self, species_name, count):
+        """Record organisms refused outright, e.g. the excess of a bulk spawn."""
+        self.throttled[species_name] += count
+        print(f"Governor: refused {count} {species_name} (limits reached)")
+
+    def admission(self, species_name):
+        """Probability that one more `species_name` organism is allowed in."""
+        if not self.enabled:
+            return 1.0
+        pressure = max(self._pressures(species_name).values())
+        if pressure <= self.soft_limit:
+            return 1.0
+        if pressure >= 1.0:
+            return 0.0
+        return (1.0 - pressure) / (1.0 - self.soft_limit)
+
+    def admit(self, species_name, rng):
+        """Decide whether one more organism may be born or spawned; only call it when one would be."""
+        probability = self.admission(species_name)
+        if probability >= 1.0 or (probability > 0.0 and rng.random() < probability):
+            return True
+
+        self.throttled[species_name] += 1
+        if probability == 0.0:
+            for limit, pressure in self._pressures(species_name).items():
+                if pressure >= 1.0 and limit not in self._limits_hit:
+                    self._limits_hit.add(limit)
+                    print(f"Governor: {limit} limit reached (population {self.total})")
+        return False
+
+    def report(self):
+        return {
+            "total": self.total,
+            "counts": dict(self.counts),
+            "estimated_mb": round(self.estimated_bytes() / (1024 * 1024), 2),
+            "throttled": dict(self.throttled),
+            "limits_hit": sorted(self._limits_hit)
+        }
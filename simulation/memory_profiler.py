@@ -0,0 +1,148 @@
+# simulation/memory_profiler.py
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+try:
+    import resource  # Not available on Windows
+except ImportError:
+    resource = None
+
+
+class MemoryProfiler:
+    """Opt-in allocation and GC instrumentation built on tracemalloc and gc.callbacks.
+
+    For every tick it records, per phase, the peak growth (tracemalloc
+    high-water mark above the phase's starting point, not the total volume
+    allocated, since memory freed and reused within the phase is not
+    counted twice) and the net change, plus GC collections and pause
+    times. Every `snapshot_every` ticks it also takes a tracemalloc snapshot
+    to find the top allocation sites. Bytes per organism are only measured
+    at bulk spawns (hence `bytes_per_organism_at_spawn`): the net traced
+    memory across the construction step of the latest one, i.e. the
+    organisms with their attributes and genetics, wherever those were
+    allocated, but not their entries in the ecosystem's indexes. Records
+    are written as JSON lines.
+    """
+
+    def __init__(self, profile_config):
+        self.sample_every = profile_config["sample_every"]
+        self.snapshot_every = profile_config["snapshot_every"]
+        self.top_sites = profile_config["top_sites"]
+
+        self.tick = 0
+        self.phases = {}
+        self.gc_collections = [0, 0, 0]
+        self.gc_pause_ms = 0.0
+        self.gc_total_pause_ms = 0.0
+        self.bytes_per_organism = None
+        self.hot_spots = []
+        self.latest = None
+
+        self._phase_start = 0
+        self._spawn_start = 0
+        self._gc_start = None
+        self._gc_paused = False
+
+        export_path = profile_config["export_path"]
+        self._export = None
+        if export_path:
+            directory = os.path.dirname(export_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._export = open(export_path, "w")
+
+        tracemalloc.start(profile_config["frames"])
+        gc.callbacks.append(self._on_gc)
+
+    def _on_gc(self, phase, info):
+        if self._gc_paused:
+            return
+        if phase == "start":
+            self._gc_start = time.perf_counter()
+        elif self._gc_start is not None:
+            pause = (time.perf_counter() - self._gc_start) * 1000
+            self._gc_start = None
+            self.gc_collections[info["generation"]] += 1
+            self.gc_pause_ms += pause
+            self.gc_total_pause_ms += pause
+
+    def begin_phase(self, name):
+        tracemalloc.reset_peak()
+        self._phase_start = tracemalloc.get_traced_memory()[0]
+
+    def end_phase(self, name):
+        current, peak = tracemalloc.get_traced_memory()
+        self.phases[name] = {
+            "peak_growth": peak - self._phase_start,
+            "net": current - self._phase_start
+        }
+
+    def begin_spawn(self):
+        self._spawn_start = tracemalloc.get_traced_memory()[0]
+
+    def end_spawn(self, count):
+        if count:
+            self.bytes_per_organism = round((tracemalloc.get_traced_memory()[0] - self._spawn_start) / count)
+
+    def start_tick(self, tick, organisms):
+        """Close the record of the previous tick (including anything rendered after it)."""
+        if self.tick and self.tick % self.sample_every == 0:
+            self._finish_record(organisms)
+        self.tick = tick
+        self.phases = {}
+        self.gc_collections = [0, 0, 0]
+        self.gc_pause_ms = 0.0
+
+    def _finish_record(self, organisms):
+        if self.tick % self.snapshot_every == 0:
+            # The snapshot allocates heavily; its collections are not the tick's
+            self._gc_paused = True
+            try:
+                self._take_snapshot()
+            finally:
+                self._gc_paused = False
+
+        self.latest = {
+            "tick": self.tick,
+            "phases": self.phases,
+            "gc_collections": self.gc_collections,
+            "gc_pause_ms": round(self.gc_pause_ms, 3),
+            "traced_bytes": tracemalloc.get_traced_memory()[0],
+            "organisms": len(organisms),
+            "bytes_per_organism_at_spawn": self.bytes_per_organism,
+            "peak_rss_kb": self.peak_rss_kb()
+        }
+        if self._export:
+            record = dict(self.latest)
+            if self.tick % self.snapshot_every == 0:
+                record["hot_spots"] = self.hot_spots
+            self._export.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def _take_snapshot(self):
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__)
+        ])
+        self.hot_spots = [
+            [f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", stat.size, stat.count]
+            for stat in snapshot.statistics("lineno")[:self.top_sites]
+        ]
+
+    @staticmethod
+    def peak_rss_kb():
+        if resource is None:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kilobytes, macOS bytes
+        return peak // 1024 if sys.platform == "darwin" else peak
+
+    def close(self):
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+        tracemalloc.stop()
+        if self._export:
+            self._export.close()
+            self._export = None
@@ -0,0 +1,388 @@
+# simulation/neighbours.py
+import math
+import numpy as np
+
+
+class NeighbourList:
+    """Verlet neighbour lists shared by competition, mating and predation.
+
+    Each animal keeps the organisms it can mate with or prey on that were
+    within interaction range + `skin` of it, measured from the positions
+    both had when the pair was last checked (their reference positions).
+    As long as neither has moved more than skin / 2 since then, every pair
+    that is actually within range is in the list, so callers only need to
+    check exact distances against the candidates. Only the animals that
+    break that bound are refreshed (`moved`), and births and deaths patch
+    just the entries they affect.
+
+    Plants never move and only compete, so instead of pair lists they keep
+    a count of the plants within their competition radius. Counts are
+    capped at `max_competitors`: above that a plant loses all its energy in
+    one tick anyway, so bulk rebuilds only count dense stands far enough to
+    tell they are past the cap. Such saturated plants keep that lower
+    bound, and are counted exactly once deaths take it below the cap.
+    Plants sit in slots of flat arrays, listed per grid cell, so a birth or
+    death adjusts every count it affects in one vectorised step.
+
+    Animals with more than `max_neighbours` organisms in the surrounding
+    grid cells keep no list of their own; `of` scans those cells instead,
+    which bounds memory in crowded worlds.
+    """
+
+    # Slots of dead plants are dropped once they outnumber both this and the live plants
+    COMPACT_AFTER = 256
+
+    # Used by PlantScheduler when the ecosystem has no neighbour list of its own
+    DEFAULT_CONFIG = {
+        "enabled": True,
+        "skin": 10,
+        "max_neighbours": 400,
+        "max_competitors": 1000
+    }
+
+    def __init__(self, neighbour_config, species_config, mating_range, predation_range):
+        self.skin = neighbour_config["skin"]
+        self.max_neighbours = neighbour_config["max_neighbours"]
+        self.max_competitors = neighbour_config["max_competitors"]
+        self.refreshes = 0
+
+        # Candidate distance per pair of species for mating and predation; pairs that never interact are left out
+        self._species = {name: index for index, name in enumerate(species_config)}
+        self._cutoff_matrix = np.zeros((len(species_config), len(species_config)))
+        self._cutoffs = {}
+        for name, config in species_config.items():
+            for other_name, other_config in species_config.items():
+                diets = (config["diet"], other_config["diet"])
+                if diets == ("Plant", "Plant"):
+                    continue
+                if name == other_name:
+                    interaction_range = mating_range
+                elif diets in (("Herbivore", "Plant"), ("Plant", "Herbivore"),
+                               ("Carnivore", "Herbivore"), ("Herbivore", "Carnivore")):
+                    interaction_range = predation_range
+                else:
+                    continue
+                self._cutoffs[(name, other_name)] = interaction_range + self.skin
+                self._cutoff_matrix[self._species[name], self._species[other_name]] = interaction_range + self.skin
+
+        radii = {config["competition_radius"] for config in species_config.values() if config["diet"] == "Plant"}
+        # Candidates are always within the 3x3 cells around an organism
+        self.cell_size = max([*self._cutoffs.values(), *radii])
+        # A finer grid of plant counts gives lower bounds for competitor counts in bulk rebuilds
+        self._fine_size = min(radii) / 8 if radii else self.cell_size
+        self._inside_offsets = {radius: self._fine_offsets(radius, inside=True) for radius in radii}
+        self._reach_offsets = {radius: self._fine_offsets(radius, inside=False) for radius in radii}
+
+        self._neighbours = {}
+        self._references = {}
+        self._grid = {}
+        self._dense = set()
+        empty = np.empty(0)
+        self._index_plants([], empty, empty, np.empty(0, np.int64), np.empty(0, bool))
+
+    def of(self, organism):
+        """Candidate mates and prey of `organism`, a superset of those within interaction range."""
+        if organism.species_config["diet"] == "Plant":
+            return ()
+        if organism in self._dense:
+            cell = self._cell(self._references[organism])
+            return [other for other in self._block(cell) if other is not organism]
+        return self._neighbours[organism]
+
+    def competitors(self, organism):
+        """Plants within a plant's competition radius (capped at max_competitors); None for animals."""
+        if organism.species_config["diet"] != "Plant":
+            return None
+        slot = self._slots[organism]
+        if self._saturated[slot] and self._counts[slot] < self.max_competitors:
+            # The lower bound no longer shows it past the cap
+            self._saturated[slot] = False
+            self._counts[slot] = self._count_within(slot)
+        return min(int(self._counts[slot]), self.max_competitors)
+
+    def competing(self, plant):
+        """Plants whose competition radius covers `plant`'s position; `plant` need not be in the list."""
+        plants = self._slot_plants
+        return [plants[slot] for slot in self._covering(plant.x, plant.y).tolist() if plants[slot] is not plant]
+
+    def add(self, organism):
+        reference = (organism.x, organism.y)
+        self._references[organism] = reference
+        self._grid.setdefault(self._cell(reference), {})[organism] = None
+        self._neighbours[organism] = {}
+        if organism.species_config["diet"] == "Plant":
+            self._counts[self._covering(*reference)] += 1
+            slot = self._new_slot(organism, reference)
+            self._counts[slot] = self._count_within(slot)
+        self._link(organism)
+
+    def add_many(self, organisms):
+        """Bulk version of add(): every list and count is rebuilt in one vectorised pass."""
+        for organism in organisms:
+            self._references[organism] = None
+        self._rebuild()
+
+    def remove(self, organism):
+        reference = self._references.pop(organism, None)
+        if reference is None:
+            return
+        self._unlink(organism)
+        del self._grid[self._cell(reference)][organism]
+        del self._neighbours[organism]
+        self._dense.discard(organism)
+        if organism.species_config["diet"] == "Plant":
+            slot = self._slots.pop(organism)
+            self._slot_plants[slot] = None
+            self._alive[slot] = False
+            self._counts[self._covering(*reference)] -= 1
+            if len(self._slot_plants) - len(self._slots) > max(self.COMPACT_AFTER, len(self._slots)):
+                self._compact()
+
+    def moved(self, organism):
+        """Refresh `organism`'s entries once it has drifted more than half the skin."""
+        x, y = self._references[organism]
+        if (organism.x - x) ** 2 + (organism.y - y) ** 2 <= (self.skin / 2) ** 2:
+            return
+        self.refreshes += 1
+        self._unlink(organism)
+        del self._grid[self._cell((x, y))][organism]
+        reference = (organism.x, organism.y)
+        self._references[organism] = reference
+        self._grid.setdefault(self._cell(reference), {})[organism] = None
+        self._link(organism)
+
+    def _link(self, organism):
+        # Pairs are only worth storing if at least one side reads its list: an animal below max_neighbours
+        x, y = self._references[organism]
+        cell = self._cell((x, y))
+        reads_list = False
+        if organism.species_config["diet"] != "Plant":
+            if self._block_population(cell) - 1 > self.max_neighbours:
+                self._dense.add(organism)
+            else:
+                self._dense.discard(organism)
+                reads_list = True
+
+        neighbours = self._neighbours[organism]
+        for other in self._block(cell):
+            if other is organism:
+                continue
+            if not reads_list and (other in self._dense or other.species_config["diet"] == "Plant"):
+                continue
+            cutoff = self._cutoffs.get((organism.species_name, other.species_name))
+            if cutoff is None:
+                continue
+            other_x, other_y = self._references[other]
+            if (x - other_x) ** 2 + (y - other_y) ** 2 < cutoff * cutoff:
+                neighbours[other] = None
+                self._neighbours[other][organism] = None
+
+    def _unlink(self, organism):
+        neighbours = self._neighbours[organism]
+        for other in neighbours:
+            del self._neighbours[other][organism]
+        neighbours.clear()
+
+    def _covering(self, x, y):
+        # Slots of the live plants whose competition radius covers (x, y)
+        slots, xs, ys, radii = self._block_plants(self._cell((x, y)))
+        distance = np.sqrt((xs - x) ** 2 + (ys - y) ** 2)
+        return slots[self._alive[slots] & (distance < radii)]
+
+    def _count_within(self, slot):
+        # Live plants within the competition radius of the plant in `slot`, not counting itself
+        x, y = float(self._plant_xs[slot]), float(self._plant_ys[slot])
+        slots, xs, ys, _ = self._block_plants(self._cell((x, y)))
+        distance = np.sqrt((xs - x) ** 2 + (ys - y) ** 2)
+        return int(np.count_nonzero(self._alive[slots] & (distance < self._radii[slot]))) - 1
+
+    def _block_plants(self, cell):
+        # Slots, positions and radii of the plants in the 3x3 cells around `cell`, kept until one is added
+        block = self._blocks.get(cell)
+        if block is None:
+            cx, cy = cell
+            slots = np.array([slot for dx in (-1, 0, 1) for dy in (-1, 0, 1)
+                              for slot in self._cell_slots.get((cx + dx, cy + dy), ())], dtype=np.int64)
+            block = self._blocks[cell] = (slots, self._plant_xs[slots], self._plant_ys[slots], self._radii[slots])
+        return block
+
+    def _new_slot(self, plant, position):
+        slot = len(self._slot_plants)
+        if slot == len(self._alive):
+            for name in ("_plant_xs", "_plant_ys", "_radii", "_counts", "_alive", "_saturated"):
+                array = getattr(self, name)
+                grown = np.zeros(2 * len(array), dtype=array.dtype)
+                grown[:slot] = array
+                setattr(self, name, grown)
+        self._slots[plant] = slot
+        self._slot_plants.append(plant)
+        self._plant_xs[slot], self._plant_ys[slot] = position
+        self._radii[slot] = plant.species_config["competition_radius"]
+        self._counts[slot] = 0
+        self._alive[slot] = True
+        self._saturated[slot] = False
+        cx, cy = self._cell(position)
+        self._cell_slots.setdefault((cx, cy), []).append(slot)
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                self._blocks.pop((cx + dx, cy + dy), None)
+        return slot
+
+    def _compact(self):
+        live = np.flatnonzero(self._alive[:len(self._slot_plants)])
+        self._index_plants([self._slot_plants[slot] for slot in live.tolist()],
+                           self._plant_xs[live], self._plant_ys[live], self._counts[live], self._saturated[live])
+
+    def _index_plants(self, plants, xs, ys, counts, saturated):
+        # Give `plants` consecutive slots, with room to grow, and list the slots per grid cell
+        size = len(plants)
+        capacity = max(64, 2 * size)
+
+        def slotted(values, dtype):
+            array = np.zeros(capacity, dtype=dtype)
+            array[:size] = values
+            return array
+
+        self._slots = dict(zip(plants, range(size)))
+        self._slot_plants = list(plants)
+        self._plant_xs = slotted(xs, float)
+        self._plant_ys = slotted(ys, float)
+        self._radii = slotted([plant.species_config["competition_radius"] for plant in plants], float)
+        self._counts = slotted(counts, np.int64)
+        self._alive = slotted(True, bool)
+        self._saturated = slotted(saturated, bool)
+
+        self._cell_slots = {}
+        self._blocks = {}
+        cxs = np.floor(xs / self.cell_size).astype(np.int64)
+        cys = np.floor(ys / self.cell_size).astype(np.int64)
+        for slot, cell in enumerate(zip(cxs.tolist(), cys.tolist())):
+            self._cell_slots.setdefault(cell, []).append(slot)
+
+    def _rebuild(self):
+        organisms = list(self._references)
+        count = len(organisms)
+        xs = np.fromiter((organism.x for organism in organisms), float, count)
+        ys = np.fromiter((organism.y for organism in organisms), float, count)
+        self._references = dict(zip(organisms, zip(xs.tolist(), ys.tolist())))
+        self._neighbours = {organism: {} for organism in organisms}
+        if not count:
+            self._grid, self._dense = {}, set()
+            self._rebuild_competitors([], xs, ys)
+            return
+
+        cxs = np.floor(xs / self.cell_size).astype(np.int64)
+        cys = np.floor(ys / self.cell_size).astype(np.int64)
+        self._grid = {}
+        for organism, cell in zip(organisms, zip(cxs.tolist(), cys.tolist())):
+            self._grid.setdefault(cell, {})[organism] = None
+
+        is_plant = np.fromiter((organism.species_config["diet"] == "Plant" for organism in organisms), bool, count)
+        plants = np.flatnonzero(is_plant)
+        self._rebuild_competitors([organisms[index] for index in plants.tolist()], xs[plants], ys[plants])
+        self._rebuild_links(organisms, xs, ys, cxs, cys, is_plant)
+
+    def _rebuild_competitors(self, plants, xs, ys):
+        counts = np.zeros(len(plants), dtype=np.int64)
+        saturated = np.zeros(len(plants), dtype=bool)
+        if plants:
+            radii = np.array([plant.species_config["competition_radius"] for plant in plants], dtype=float)
+            fxs = np.floor(xs / self._fine_size).astype(np.int64)
+            fys = np.floor(ys / self._fine_size).astype(np.int64)
+            grid = _CellBlocks(fxs, fys, max(i for offsets in self._reach_offsets.values() for i, _ in offsets))
+            for radius in np.unique(radii).tolist():
+                group = np.flatnonzero(radii == radius)
+                # Cells entirely within the radius count as a whole; only the cells it crosses need distances
+                lower = sum(grid.population(group, i, j) for i, j in self._inside_offsets[radius]) - 1
+                saturated[group[lower >= self.max_competitors]] = True
+                counts[group] = lower
+                sources = group[lower < self.max_competitors]
+                inside = set(self._inside_offsets[radius])
+                for i, j in self._reach_offsets[radius]:
+                    if (i, j) in inside:
+                        continue
+                    source, other = grid.pairs(sources, i, j)
+                    distance = np.sqrt((xs[source] - xs[other]) ** 2 + (ys[source] - ys[other]) ** 2)
+                    counts += np.bincount(source[(distance < radius) & (other != source)], minlength=len(plants))
+        self._index_plants(plants, xs, ys, counts, saturated)
+
+    def _rebuild_links(self, organisms, xs, ys, cxs, cys, is_plant):
+        grid = _CellBlocks(cxs, cys, 1)
+        everyone = np.arange(len(organisms))
+        block = sum(grid.population(everyone, i, j) for i in (-1, 0, 1) for j in (-1, 0, 1))
+        dense = ~is_plant & (block - 1 > self.max_neighbours)
+        self._dense = {organisms[index] for index in np.flatnonzero(dense).tolist()}
+
+        species = np.fromiter((self._species[organism.species_name] for organism in organisms), np.int64, len(organisms))
+        readers = np.flatnonzero(~is_plant & ~dense)
+        sources, others = [], []
+        for i in (-1, 0, 1):
+            for j in (-1, 0, 1):
+                source, other = grid.pairs(readers, i, j)
+                cutoff = self._cutoff_matrix[species[source], species[other]]
+                near = ((xs[source] - xs[other]) ** 2 + (ys[source] - ys[other]) ** 2 < cutoff * cutoff) & (other != source)
+                sources.append(source[near])
+                others.append(other[near])
+        sources = np.concatenate(sources)
+        others = np.concatenate(others)
+        order = np.lexsort((others, sources))
+
+        neighbours = self._neighbours
+        for source, other in zip(sources[order].tolist(), others[order].tolist()):
+            neighbours[organisms[source]][organisms[other]] = None
+            neighbours[organisms[other]][organisms[source]] = None
+
+    def _fine_offsets(self, radius, inside):
+        # Fine-cell offsets whose every point (inside=True) or some point (inside=False)
+        # is within `radius` of every/some point of the origin cell
+        size = self._fine_size
+        reach = math.ceil(radius / size) + 1
+        offsets = []
+        for i in range(-reach, reach + 1):
+            for j in range(-reach, reach + 1):
+                if inside:
+                    if ((abs(i) + 1) * size) ** 2 + ((abs(j) + 1) * size) ** 2 < radius * radius:
+                        offsets.append((i, j))
+                elif (max(abs(i) - 1, 0) * size) ** 2 + (max(abs(j) - 1, 0) * size) ** 2 <= radius * radius:
+                    offsets.append((i, j))
+        return offsets
+
+    def _block(self, cell):
+        cx, cy = cell
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                yield from self._grid.get((cx + dx, cy + dy), ())
+
+    def _block_population(self, cell):
+        cx, cy = cell
+        return sum(len(self._grid.get((cx + dx, cy + dy), ())) for dx in (-1, 0, 1) for dy in (-1, 0, 1))
+
+    def _cell(self, position):
+        # Same rounding as the vectorised rebuild, so both agree on cell membership
+        return math.floor(position[0] / self.cell_size), math.floor(position[1] / self.cell_size)
+
+
+class _CellBlocks:
+    """Points bucketed into a dense array of grid cells, for vectorised cell-pair queries."""
+
+    def __init__(self, cxs, cys, reach):
+        # `reach` is the largest cell offset that will be queried
+        self.xs = cxs - cxs.min() + reach
+        self.ys = cys - cys.min() + reach
+        self.height = int(self.ys.max()) + reach + 1
+        width = int(self.xs.max()) + reach + 1
+        self.cells = self.xs * self.height + self.ys
+        self.counts = np.bincount(self.cells, minlength=width * self.height)
+        self.starts = np.cumsum(self.counts) - self.counts
+        self.order = np.argsort(self.cells, kind="stable")
+
+    def population(self, points, i, j):
+        return self.counts[self.cells[points] + i * self.height + j]
+
+    def pairs(self, points, i, j):
+        """Every (point, other) pair with `other` in the cell offset by (i, j) from `point`'s cell."""
+        targets = self.cells[points] + i * self.height + j
+        counts = self.counts[targets]
+        total = int(counts.sum())
+        ramp = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        return np.repeat(points, counts), self.order[np.repeat(self.starts[targets], counts) + ramp]
\ No newline at end of file
@@ -0,0 +1,206 @@
+# simulation/plant_scheduler.py
+import heapq
+import itertools
+import math
+from collections import deque
+from dataclasses import dataclass
+from .neighbours import NeighbourList
+
+
+@dataclass
+class PlantState:
+    last_tick: int                 # plant state includes every tick up to this one
+    neighbours: int = 0            # competitor count in effect since last_tick
+    version: int = 0               # bumped on every reschedule; stale heap entries are skipped
+    reproduce_at: float = math.inf
+
+
+class PlantScheduler:
+    """Event-driven updates for plants.
+
+    Plants never move, so between disturbances their energy and health only
+    depend on the environment, which is the same for every plant. The
+    scheduler keeps running sums of the plant energy gain and of the
+    temperature deviation from each plant species' optimum, and brings a
+    plant up to date ("settles" it) only when one of its events fires:
+    reproduction, running out of energy or health, a season change, or
+    `max_interval` ticks having passed. Adding or removing a plant marks
+    the plants within competition range of it; before the next events are
+    popped, those whose competitor count actually changed are settled up
+    to the tick of the change and rescheduled, once each however many
+    neighbours they lost or gained.
+    Competitor counts come from the ecosystem's NeighbourList, or from a
+    private one when the ecosystem runs without neighbour lists.
+
+    Settling clamps energy to [0, 100] once per interval rather than every
+    tick, and reproduction chances are drawn as a geometric waiting time,
+    so runs are statistically (not bit-for-bit) equivalent to tick mode.
+    """
+
+    def __init__(self, scheduler_config, species_config, rng, neighbours=None):
+        self.max_interval = scheduler_config["max_interval"]
+        self.rng = rng
+        plant_configs = [config for config in species_config.values() if config["diet"] == "Plant"]
+        # Without a shared neighbour list the scheduler keeps one for plants only
+        self._owns_neighbours = neighbours is None
+        if neighbours is None:
+            neighbours = NeighbourList(NeighbourList.DEFAULT_CONFIG, species_config, 0, 0)
+        self.neighbours = neighbours
+
+        # Running sums, newest last; one entry per tick back to max_interval ago
+        history_length = self.max_interval + 2
+        self._gain_history = deque([0.0], maxlen=history_length)
+        self._deviation_history = {
+            config["optimal_temp"]: deque([0.0], maxlen=history_length)
+            for config in plant_configs
+        }
+        self._gain = 0.0
+        self._temperature = 0.0
+        self._season_change = math.inf
+
+        self._states = {}
+        self._queue = []
+        self._sequence = itertools.count()
+        self._disturbed = {}  # plant -> tick its competitor count may first have changed
+        self.events_processed = 0
+
+    def record(self, tick, environment):
+        """Append this tick's environment to the running sums; call once per tick."""
+        self._gain = environment.plant_energy_gain()
+        self._temperature = environment.factors.temperature
+        self._season_change = tick + environment.ticks_until_season_change()
+        self._gain_history.append(self._gain_history[-1] + self._gain)
+        for optimal_temp, history in self._deviation_history.items():
+            history.append(history[-1] + abs(self._temperature - optimal_temp))
+
+    def add(self, plant, tick):
+        """Schedule a new plant; a shared neighbour list must already contain it."""
+        if self._owns_neighbours:
+            self.neighbours.add(plant)
+        self._mark_disturbed(self.neighbours.competing(plant), tick)
+        self._states[plant] = PlantState(tick, self.neighbours.competitors(plant))
+        self.schedule(plant, tick)
+
+    def add_many(self, plants, tick):
+        """Bulk version of add(): only plants whose competitor count changed are disturbed."""
+        if self._owns_neighbours:
+            self.neighbours.add_many(plants)
+        self._mark_disturbed(self._states, tick)
+        for plant in plants:
+            self._states[plant] = PlantState(tick, self.neighbours.competitors(plant))
+            self.schedule(plant, tick)
+
+    def remove(self, plant, tick):
+        """Unschedule a plant; a shared neighbour list must already have dropped it."""
+        if self._states.pop(plant, None) is None:
+            return
+        if self._owns_neighbours:
+            self.neighbours.remove(plant)
+        self._mark_disturbed(self.neighbours.competing(plant), tick)
+
+    def pop_due(self, tick):
+        """Settle and return every plant whose next event is at or before `tick`."""
+        self._reschedule_disturbed()
+        due = []
+        while self._queue and self._queue[0][0] <= tick:
+            _, _, version, plant = heapq.heappop(self._queue)
+            state = self._states.get(plant)
+            if state is None or state.version != version:
+                continue
+            self.settle(plant, tick)
+            due.append(plant)
+        self.events_processed += len(due)
+        return due
+
+    def reproduction_due(self, plant, tick):
+        return self._states[plant].reproduce_at <= tick
+
+    def settle(self, plant, tick):
+        """Apply every tick since the plant was last touched."""
+        state = self._states[plant]
+        elapsed = tick - state.last_tick
+        if elapsed <= 0:
+            return
+        config = plant.species_config
+        gain = self._gain_history[-1] - self._gain_history[-1 - elapsed]
+        deviation_history = self._deviation_history[config["optimal_temp"]]
+        deviation = deviation_history[-1] - deviation_history[-1 - elapsed]
+
+        start = plant.energy
+        end = start + gain - self._consumption(plant, state) * elapsed
+        plant.energy = max(0, min(100, end))
+        plant.health = max(0, plant.health
+                           - deviation * (1 - plant.genetics.temperature_tolerance) * 0.1
+                           - self._ticks_below(start, end, elapsed, 20))
+        plant.age += elapsed
+        plant.reproduction_cooldown = max(0, plant.reproduction_cooldown - elapsed)
+        state.last_tick = tick
+
+    def schedule(self, plant, tick):
+        """Compute the plant's next significant event and queue it."""
+        state = self._states[plant]
+        state.version += 1
+        config = plant.species_config
+        energy, health = plant.energy, plant.health
+        net_gain = self._gain - self._consumption(plant, state)
+
+        candidates = [self.max_interval, self._season_change - tick]
+        if net_gain < 0:
+            candidates.append(math.ceil(energy / -net_gain))  # energy runs out
+            if energy >= 20:
+                candidates.append(math.ceil((energy - 20) / -net_gain) + 1)  # low-energy damage starts
+        damage = (abs(self._temperature - config["optimal_temp"])
+                  * (1 - plant.genetics.temperature_tolerance) * 0.1
+                  + (1 if energy < 20 else 0))
+        if damage > 0:
+            candidates.append(math.ceil(health / damage))
+
+        if energy > 60 and health > 50:
+            if state.reproduce_at <= tick or state.reproduce_at == math.inf:
+                state.reproduce_at = tick + plant.reproduction_cooldown + self._waiting_time(config["reproduction_rate"])
+            candidates.append(state.reproduce_at - tick)
+        else:
+            state.reproduce_at = math.inf
+            if net_gain > 0 and energy <= 60:
+                candidates.append(math.floor((60 - energy) / net_gain) + 1)  # becomes fertile
+
+        delay = max(1, min(candidates))
+        heapq.heappush(self._queue, (tick + delay, next(self._sequence), state.version, plant))
+
+    def _mark_disturbed(self, plants, tick):
+        disturbed = self._disturbed
+        for plant in plants:
+            if plant not in disturbed:
+                disturbed[plant] = tick
+
+    def _reschedule_disturbed(self):
+        disturbed, self._disturbed = self._disturbed, {}
+        for plant, tick in disturbed.items():
+            state = self._states.get(plant)
+            # Plants already past max_competitors read the same capped count, so their schedule stands
+            if state is None or state.neighbours == self.neighbours.competitors(plant):
+                continue
+            # Settle with the old competition level before switching to the new one
+            self.settle(plant, tick)
+            state.neighbours = self.neighbours.competitors(plant)
+            self.schedule(plant, tick)
+
+    def _consumption(self, plant, state):
+        return plant.species_config["energy_consumption"] + 0.1 * state.neighbours
+
+    def _waiting_time(self, probability):
+        # Ticks until the first success of a per-tick Bernoulli(probability) trial
+        if probability >= 1:
+            return 1
+        return 1 + int(math.log(1.0 - self.rng.random()) / math.log(1.0 - probability))
+
+    @staticmethod
+    def _ticks_below(start, end, elapsed, threshold):
+        # Energy is treated as changing linearly over the interval
+        if start < threshold and end < threshold:
+            return elapsed
+        if start >= threshold and end >= threshold:
+            return 0
+        if start >= threshold:
+            return elapsed * (threshold - end) / (start - end)
+        return elapsed * (threshold - start) / (end - start)
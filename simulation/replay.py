@@ -0,0 +1,68 @@
+# simulation/replay.py
+import json
+import os
+from collections import deque
+
+
+class ReplayLog:
+    """Compact record of a run: the master seed plus every user input and its tick.
+
+    Events are stored as flat lists, e.g. [120, "spawn", "Wolf", 300, 540]
+    or [410, "pause"]. Together with the seed this is enough to rebuild the
+    run exactly.
+    """
+
+    VERSION = 1
+
+    def __init__(self, seed, events=None, ticks=0, scenario=None):
+        self.seed = seed
+        self.events = events if events is not None else []
+        self.ticks = ticks
+        self.scenario = scenario  # path of the scenario file the run started from, if any
+
+    def record(self, tick, kind, *args):
+        self.events.append([tick, kind, *args])
+
+    def save(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({
+                "version": self.VERSION,
+                "seed": self.seed,
+                "ticks": self.ticks,
+                "scenario": self.scenario,
+                "events": self.events
+            }, f, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            data = json.load(f)
+        if data.get("version") != cls.VERSION:
+            raise ValueError(f"Unsupported replay version: {data.get('version')}")
+        return cls(data["seed"], data["events"], data["ticks"], data.get("scenario"))
+
+
+def replay(ecosystem, log, on_tick=None):
+    """Drive `ecosystem` through the inputs recorded in `log`.
+
+    `ecosystem` must be freshly built with `seed=log.seed` (and set up
+    from `log.scenario` if there is one). `on_tick` is
+    called after every update (e.g. to render) and may return False to stop
+    early; leave it as None to replay as fast as possible without rendering.
+    """
+    pending = deque(log.events)
+    while ecosystem.tick < log.ticks:
+        # Inputs recorded at tick T were applied before the T -> T+1 update
+        while pending and pending[0][0] <= ecosystem.tick:
+            _, kind, *args = pending.popleft()
+            ecosystem.apply_input(kind, *args)
+        if ecosystem.paused:
+            # The recording ended while paused; nothing can advance any further
+            break
+        ecosystem.update()
+        if on_tick is not None and on_tick(ecosystem) is False:
+            break
+    return ecosystem
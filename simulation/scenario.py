@@ -0,0 +1,130 @@
+# simulation/scenario.py
+import json
+import time
+from dataclasses import fields
+import numpy as np
+from entities import Season, Weather
+from entities.environment import EnvironmentalFactors
+
+
+class Scenario:
+    """A starting setup for an ecosystem, loaded from a JSON file.
+
+    Example::
+
+        {
+            "description": "Wolves breeding slowly through a rainy summer",
+            "seed": 42,
+            "species": {"Wolf": {"reproduction_rate": 0.004}},
+            "governor": {"max_population": 120000, "memory_budget_mb": 128},
+            "environment": {"season": "Summer", "weather": "Rainy", "time": 1000,
+                            "factors": {"temperature": 28.0}},
+            "populations": {"Grass": 50000, "Tree": 2000},
+            "organisms": [
+                {"species": "Deer", "x": [100, 200], "y": [540, 550],
+                 "genetics": {"size_modifier": [1.1, 0.9]}}
+            ]
+        }
+
+    `species` entries are merged over the base SPECIES_CONFIG, or define new
+    species in full, and `governor` is merged over the base GOVERNOR_CONFIG,
+    so large scenarios can raise the population and memory limits (species
+    carrying capacities are set under `species`). `populations` are placed
+    at random, `organisms` at the given coordinates; within a group, `x`,
+    `y`, a `species` list and every `genetics` list must have the same
+    length. `description` is free text for readers of the file and is not
+    used. Every section is optional.
+
+    scenarios/load_benchmark.json only measures how fast a large scenario
+    loads; its populations are far beyond what the world can sustain.
+    """
+
+    REQUIRED_SPECIES_KEYS = (
+        "color", "size", "diet", "optimal_temp", "energy_consumption", "lifespan",
+        "reproduction_rate", "mutation_chance", "min_reproduction_energy"
+    )
+
+    def __init__(self, data, path=None):
+        self.path = path
+        self.seed = data.get("seed")
+        self.species = data.get("species", {})
+        self.governor = data.get("governor", {})
+        self.environment = data.get("environment", {})
+        self.populations = data.get("populations", {})
+        self.organisms = data.get("organisms", [])
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls(json.load(f), path)
+
+    def species_config(self, base_species_config):
+        """The base species config with this scenario's overrides and new species applied."""
+        species_config = {name: dict(config) for name, config in base_species_config.items()}
+        for name, overrides in self.species.items():
+            config = {**species_config.get(name, {}), **overrides}
+            missing = [key for key in self.REQUIRED_SPECIES_KEYS if key not in config]
+            if config.get("diet") == "Plant" and "competition_radius" not in config:
+                missing.append("competition_radius")
+            if missing:
+                raise ValueError(f"Species {name} is missing {', '.join(missing)}")
+            species_config[name] = config
+        return species_config
+
+    def governor_config(self, base_governor_config):
+        """The base governor config with this scenario's overrides applied."""
+        unknown = [key for key in self.governor if key not in base_governor_config]
+        if unknown:
+            raise ValueError(f"Unknown governor setting: {', '.join(unknown)}")
+        return {**base_governor_config, **self.governor}
+
+    def apply(self, ecosystem):
+        """Set the environment and spawn the initial organisms into `ecosystem`."""
+        environment = ecosystem.environment
+        if "season" in self.environment:
+            environment.season = Season(self.environment["season"])
+        if "weather" in self.environment:
+            environment.weather = Weather(self.environment["weather"])
+        if "time" in self.environment:
+            environment.time = self.environment["time"]
+        factor_names = {field.name for field in fields(EnvironmentalFactors)}
+        for name, value in self.environment.get("factors", {}).items():
+            if name not in factor_names:
+                raise ValueError(f"Unknown environmental factor: {name}")
+            setattr(environment.factors, name, value)
+
+        # Everything goes into a single spawn_bulk call; missing genetics are NaN, i.e. rolled
+        start = time.perf_counter()
+        species_config = ecosystem.config["SPECIES_CONFIG"]
+        unknown = [name for name in self.populations if name not in species_config]
+        if unknown:
+            raise ValueError(f"Unknown species in populations: {', '.join(unknown)}")
+        names, xs, ys = ecosystem.placements(self.populations)
+        xs, ys = [xs], [ys]
+        given = []  # (offset, genetics) per group
+        for index, group in enumerate(self.organisms):
+            count = len(group["x"])
+            if len(group["y"]) != count:
+                raise ValueError(f"Organism group {index}: {count} x values but {len(group['y'])} y values")
+            species = [group["species"]] * count if isinstance(group["species"], str) else group["species"]
+            if len(species) != count:
+                raise ValueError(f"Organism group {index}: {len(species)} species for {count} positions")
+            unknown = [name for name in dict.fromkeys(species) if name not in species_config]
+            if unknown:
+                raise ValueError(f"Organism group {index}: unknown species {', '.join(unknown)}")
+            for trait, values in group.get("genetics", {}).items():
+                if len(values) != count:
+                    raise ValueError(f"Organism group {index}: {len(values)} {trait} values for {count} positions")
+            given.append((len(names), group.get("genetics", {})))
+            names.extend(species)
+            xs.append(np.asarray(group["x"], dtype=float))
+            ys.append(np.asarray(group["y"], dtype=float))
+        genetics = {}
+        for offset, traits in given:
+            for trait, values in traits.items():
+                column = genetics.setdefault(trait, np.full(len(names), np.nan))
+                column[offset:offset + len(values)] = values
+
+        spawned = ecosystem.spawn_bulk(names, np.concatenate(xs), np.concatenate(ys), genetics)
+        print(f"Scenario {self.path}: loaded {len(spawned)} organisms in {time.perf_counter() - start:.2f} s")
+        return spawned
@@ -0,0 +1,213 @@
+# simulation/telemetry.py
+import asyncio
+import json
+import math
+import queue
+import threading
+import time
+from dataclasses import asdict
+
+
+def _finite_number(value):
+    # JSON accepts NaN, Infinity and 1e400 (which parses to inf); booleans are ints in Python
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return False
+    try:
+        return math.isfinite(value)
+    except OverflowError:  # An integer too large for a float
+        return False
+
+
+class TelemetryServer:
+    """Localhost telemetry for a running simulation.
+
+    Speaks newline-delimited JSON over plain TCP: every connected client
+    receives snapshots at `rate` per second and may send commands such as
+    {"cmd": "pause"}, {"cmd": "speed", "value": 4} or
+    {"cmd": "spawn", "species": "Wolf", "x": 300, "y": 540}; malformed
+    commands and unknown species are answered with an {"error": ...} line.
+    A plain HTTP GET returns the latest snapshot once, for dashboards.
+
+    The asyncio loop runs on its own thread. Each client has a small
+    bounded queue; when a client falls behind the oldest snapshot is
+    dropped, so slow clients never stall the tick thread.
+    """
+
+    COMMANDS = ("pause", "speed", "spawn")
+
+    def __init__(self, telemetry_config, species_names):
+        self.species_names = tuple(species_names)
+        self.host = telemetry_config["host"]
+        self.port = telemetry_config["port"]
+        self.interval = 1.0 / telemetry_config["rate"]
+        self.client_queue_size = telemetry_config["client_queue_size"]
+        self.commands = queue.Queue(maxsize=telemetry_config["command_queue_size"])
+
+        self._clients = set()  # only touched on the loop thread
+        self._latest = None
+        self._last_publish = 0.0
+        self._last_counts = {}
+        self._loop = None
+        self._thread = None
+        self._server = None
+        self._error = None
+
+    def start(self):
+        self._loop = asyncio.new_event_loop()
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(ready,), name="telemetry", daemon=True)
+        self._thread.start()
+        ready.wait()
+        if self._error:
+            raise self._error
+        print(f"Telemetry listening on {self.host}:{self.port}")
+
+    def _run(self, ready):
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._server = self._loop.run_until_complete(
+                asyncio.start_server(self._handle_client, self.host, self.port)
+            )
+        except OSError as e:
+            self._error = e
+            ready.set()
+            self._loop.close()
+            return
+        ready.set()
+        self._loop.run_forever()
+        self._loop.close()
+
+    def stop(self):
+        if self._thread is None or not self._thread.is_alive():
+            return
+        future = asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop)
+        try:
+            future.result(timeout=2)
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=2)
+
+    async def _shutdown(self):
+        self._server.close()
+        for task in asyncio.all_tasks():
+            if task is not asyncio.current_task():
+                task.cancel()
+        await self._server.wait_closed()
+
+    # ---- tick thread side ----
+
+    def publish(self, ecosystem, timings=None):
+        """Queue a snapshot for connected clients; cheap no-op between intervals."""
+        now = time.perf_counter()
+        if now - self._last_publish < self.interval or not self._clients:
+            return
+        self._last_publish = now
+
+        counts = {category: history[-1] for category, history in ecosystem.statistics.items() if history}
+        deltas = {category: count - self._last_counts.get(category, count) for category, count in counts.items()}
+        self._last_counts = counts
+
+        environment = ecosystem.environment
+        snapshot = {
+            "tick": ecosystem.tick,
+            "paused": ecosystem.paused,
+            "statistics": counts,
+            "deltas": deltas,
+            "environment": {
+                "season": environment.season.value,
+                "weather": environment.weather.value,
+                "time": environment.time,
+                **asdict(environment.factors)
+            },
+            "timings_ms": {**ecosystem.phase_timings, **(timings or {})},
+            "governor": ecosystem.governor.report(),
+            "traits": ecosystem.get_trait_statistics(histograms=False)
+        }
+        self._loop.call_soon_threadsafe(self._broadcast, snapshot)
+
+    def drain_commands(self):
+        """Return every command received since the last call."""
+        commands = []
+        while True:
+            try:
+                commands.append(self.commands.get_nowait())
+            except queue.Empty:
+                return commands
+
+    # ---- loop thread side ----
+
+    def _broadcast(self, snapshot):
+        data = json.dumps(snapshot, separators=(",", ":")).encode() + b"\n"
+        self._latest = data
+        for client_queue in self._clients:
+            if client_queue.full():
+                client_queue.get_nowait()  # drop the stale update
+            client_queue.put_nowait(data)
+
+    async def _handle_client(self, reader, writer):
+        try:
+            first_line = await reader.readline()
+            if first_line.startswith(b"GET "):
+                await self._serve_http(writer)
+                return
+
+            client_queue = asyncio.Queue(maxsize=self.client_queue_size)
+            self._clients.add(client_queue)
+            try:
+                if first_line.strip():
+                    self._handle_command(first_line, writer)
+                sender = asyncio.ensure_future(self._send_updates(client_queue, writer))
+                receiver = asyncio.ensure_future(self._receive_commands(reader, writer))
+                done, pending = await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+                for task in pending:
+                    task.cancel()
+            finally:
+                self._clients.discard(client_queue)
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    async def _serve_http(self, writer):
+        body = self._latest or b"{}\n"
+        writer.write(
+            b"HTTP/1.0 200 OK\r\n"
+            b"Content-Type: application/json\r\n"
+            b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body
+        )
+        await writer.drain()
+
+    async def _send_updates(self, client_queue, writer):
+        while True:
+            writer.write(await client_queue.get())
+            await writer.drain()
+
+    async def _receive_commands(self, reader, writer):
+        while True:
+            line = await reader.readline()
+            if not line:
+                return
+            if line.strip():
+                self._handle_command(line, writer)
+
+    def _handle_command(self, line, writer):
+        try:
+            command = json.loads(line)
+            if not isinstance(command, dict) or command.get("cmd") not in self.COMMANDS:
+                raise ValueError(f"expected one of {', '.join(self.COMMANDS)}")
+            if command["cmd"] == "speed" and not _finite_number(command.get("value")):
+                raise ValueError("speed needs a finite numeric value")
+            if command["cmd"] == "spawn":
+                if not isinstance(command.get("species"), str):
+                    raise ValueError("spawn needs a species name")
+                if command["species"] not in self.species_names:
+                    raise ValueError(f"unknown species {command['species']!r}; expected one of "
+                                     f"{', '.join(self.species_names)}")
+                for axis in ("x", "y"):
+                    if command.get(axis) is not None and not _finite_number(command[axis]):
+                        raise ValueError(f"spawn {axis} must be a finite number or null")
+            self.commands.put_nowait(command)
+        except queue.Full:
+            writer.write(b'{"error":"command queue full"}\n')
+        except ValueError as e:
+            writer.write(json.dumps({"error": str(e)}).encode() + b"\n")
@@ -0,0 +1,215 @@
+# simulation/trait_analytics.py
+import math
+from dataclasses import fields
+import numpy as np
+from entities import Genetics
+
+TRAITS = tuple(field.name for field in fields(Genetics))
+
+
+class RunningStats:
+    """Welford mean/variance that also supports removing a sample."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    def add_many(self, values):
+        # Merge a batch using Chan et al.'s parallel update
+        count = len(values)
+        if count == 0:
+            return
+        batch_mean = float(np.mean(values))
+        batch_m2 = float(np.sum((values - batch_mean) ** 2))
+        total = self.count + count
+        delta = batch_mean - self.mean
+        self.mean += delta * count / total
+        self._m2 += batch_m2 + delta * delta * self.count * count / total
+        self.count = total
+
+    def remove(self, value):
+        if self.count <= 1:
+            self.count, self.mean, self._m2 = 0, 0.0, 0.0
+            return
+        previous_mean = (self.count * self.mean - value) / (self.count - 1)
+        self._m2 = max(0.0, self._m2 - (value - previous_mean) * (value - self.mean))
+        self.mean = previous_mean
+        self.count -= 1
+
+    @property
+    def variance(self):
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+
+class Histogram:
+    """Fixed-width bins over [low, high) with underflow/overflow counters."""
+
+    def __init__(self, low, high, bins):
+        self.low = low
+        self.high = high
+        self.width = (high - low) / bins
+        self.counts = [0] * bins
+        self.underflow = 0
+        self.overflow = 0
+
+    def _update(self, value, change):
+        if value < self.low:
+            self.underflow += change
+        elif value >= self.high:
+            self.overflow += change
+        else:
+            self.counts[int((value - self.low) / self.width)] += change
+
+    def add(self, value):
+        self._update(value, 1)
+
+    def add_many(self, values):
+        indices = np.floor((values - self.low) / self.width).astype(np.int64)
+        self.underflow += int(np.count_nonzero(indices < 0))
+        self.overflow += int(np.count_nonzero(indices >= len(self.counts)))
+        inside = indices[(indices >= 0) & (indices < len(self.counts))]
+        for index, count in enumerate(np.bincount(inside, minlength=len(self.counts)).tolist()):
+            self.counts[index] += count
+
+    def remove(self, value):
+        self._update(value, -1)
+
+
+class QuantileSketch:
+    """Log-bucketed quantile sketch with a relative error bound (as in DDSketch).
+
+    Buckets are keyed by ceil(log_gamma(value)), so any quantile is returned
+    within `relative_accuracy` of a true sample value, the range is
+    unbounded and samples can be removed again.
+    """
+
+    def __init__(self, relative_accuracy):
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.zero_count = 0  # samples <= 0 (not expected for traits)
+        self.count = 0
+
+    def _key(self, value):
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def add(self, value):
+        self.count += 1
+        if value <= 0:
+            self.zero_count += 1
+            return
+        key = self._key(value)
+        self.buckets[key] = self.buckets.get(key, 0) + 1
+
+    def add_many(self, values):
+        self.count += len(values)
+        positive = values[values > 0]
+        self.zero_count += len(values) - len(positive)
+        keys, counts = np.unique(np.ceil(np.log(positive) / self._log_gamma).astype(np.int64), return_counts=True)
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            self.buckets[key] = self.buckets.get(key, 0) + count
+
+    def remove(self, value):
+        self.count -= 1
+        if value <= 0:
+            self.zero_count -= 1
+            return
+        key = self._key(value)
+        if self.buckets[key] == 1:
+            del self.buckets[key]
+        else:
+            self.buckets[key] -= 1
+
+    def quantile(self, q):
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if rank < seen:
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+
+class TraitAnalytics:
+    """Per-species genetic trait distributions, updated only on birth and death."""
+
+    QUANTILES = (0.1, 0.5, 0.9)
+    # Used when the ecosystem config has no TRAIT_ANALYTICS_CONFIG
+    DEFAULT_CONFIG = {
+        "histogram_range": (0.5, 1.5),
+        "histogram_bins": 20,
+        "relative_accuracy": 0.01
+    }
+
+    def __init__(self, analytics_config, species_names):
+        low, high = analytics_config["histogram_range"]
+        bins = analytics_config["histogram_bins"]
+        accuracy = analytics_config["relative_accuracy"]
+        self.births = {name: 0 for name in species_names}
+        self.deaths = {name: 0 for name in species_names}
+        self.stats = {name: {trait: RunningStats() for trait in TRAITS} for name in species_names}
+        self.histograms = {name: {trait: Histogram(low, high, bins) for trait in TRAITS} for name in species_names}
+        self.sketches = {name: {trait: QuantileSketch(accuracy) for trait in TRAITS} for name in species_names}
+
+    def added(self, organism):
+        name = organism.species_name
+        self.births[name] += 1
+        for trait in TRAITS:
+            value = getattr(organism.genetics, trait)
+            self.stats[name][trait].add(value)
+            self.histograms[name][trait].add(value)
+            self.sketches[name][trait].add(value)
+
+    def added_many(self, species_name, genetics):
+        """Bulk version of added(); `genetics` maps each trait to a numpy array."""
+        self.births[species_name] += len(genetics[TRAITS[0]])
+        for trait in TRAITS:
+            values = genetics[trait]
+            self.stats[species_name][trait].add_many(values)
+            self.histograms[species_name][trait].add_many(values)
+            self.sketches[species_name][trait].add_many(values)
+
+    def removed(self, organism):
+        name = organism.species_name
+        self.deaths[name] += 1
+        for trait in TRAITS:
+            value = getattr(organism.genetics, trait)
+            self.stats[name][trait].remove(value)
+            self.histograms[name][trait].remove(value)
+            self.sketches[name][trait].remove(value)
+
+    def summary(self, histograms=True):
+        result = {}
+        for name, traits in self.stats.items():
+            trait_summary = {}
+            for trait, stats in traits.items():
+                sketch = self.sketches[name][trait]
+                entry = {
+                    "mean": stats.mean,
+                    "std": math.sqrt(stats.variance),
+                    **{f"p{int(q * 100)}": sketch.quantile(q) for q in self.QUANTILES}
+                }
+                if histograms:
+                    histogram = self.histograms[name][trait]
+                    entry["histogram"] = list(histogram.counts)
+                    entry["underflow"] = histogram.underflow
+                    entry["overflow"] = histogram.overflow
+                trait_summary[trait] = entry
+            result[name] = {
+                "population": self.stats[name][TRAITS[0]].count,
+                "births": self.births[name],
+                "deaths": self.deaths[name],
+                "traits": trait_summary
+            }
+        return result
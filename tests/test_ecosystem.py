@@ -0,0 +1,38 @@
+# tests/test_ecosystem.py
+import math
+import pytest
+
+from config import (WINDOW_CONFIG, SPECIES_CONFIG, GOVERNOR_CONFIG,
+                    NEIGHBOUR_LIST_CONFIG, PLANT_SCHEDULER_CONFIG)
+from simulation import Ecosystem
+
+
+@pytest.fixture
+def ecosystem():
+    config = {
+        "WINDOW_CONFIG": WINDOW_CONFIG,
+        "SPECIES_CONFIG": SPECIES_CONFIG,
+        "INITIAL_POPULATION": {},
+        "GOVERNOR_CONFIG": GOVERNOR_CONFIG,
+        "NEIGHBOUR_LIST_CONFIG": NEIGHBOUR_LIST_CONFIG,
+        "PLANT_SCHEDULER_CONFIG": PLANT_SCHEDULER_CONFIG,
+    }
+    return Ecosystem(config, seed=3)
+
+
+def test_spawn_bulk_places_given_genetics(ecosystem):
+    spawned = ecosystem.spawn_bulk(["Wolf", "Deer"], [100, 200], [540, 550], {"size_modifier": [1.1, math.nan]})
+    assert [organism.species_name for organism in spawned] == ["Wolf", "Deer"]
+    assert spawned[0].genetics.size_modifier == 1.1
+    assert 0.8 <= spawned[1].genetics.size_modifier <= 1.2
+
+
+@pytest.mark.parametrize("species, xs, ys, genetics", [
+    (["Wolf"], [100, 200, 300], [540] * 3, None),
+    ("Wolf", [100, 200, 300], [540] * 2, None),
+    ("Deer", [100, 200], [540, 550], {"size_modifier": [1.1]}),
+], ids=["species", "ys", "genetics"])
+def test_spawn_bulk_rejects_mismatched_lengths(ecosystem, species, xs, ys, genetics):
+    with pytest.raises(ValueError):
+        ecosystem.spawn_bulk(species, xs, ys, genetics)
+    assert ecosystem.organisms == []
\ No newline at end of file
@@ -0,0 +1,104 @@
+# tests/test_neighbours.py
+import pytest
+
+from config import (WINDOW_CONFIG, SPECIES_CONFIG, GOVERNOR_CONFIG,
+                    NEIGHBOUR_LIST_CONFIG, PLANT_SCHEDULER_CONFIG)
+from entities.organism import MATING_RANGE
+from simulation import Ecosystem
+from simulation.ecosystem import PREDATION_RANGE
+
+POPULATION = {"Tree": 60, "Grass": 300, "Rabbit": 40, "Deer": 20, "Wolf": 10}
+# Small enough that the dense-animal and saturated-plant paths are taken
+SMALL_CAPS = {"max_neighbours": 20, "max_competitors": 15}
+
+
+def make_ecosystem(population, lists=True, scheduler=False, seed=11, **neighbour_config):
+    config = {
+        "WINDOW_CONFIG": WINDOW_CONFIG,
+        "SPECIES_CONFIG": SPECIES_CONFIG,
+        "INITIAL_POPULATION": population,
+        "GOVERNOR_CONFIG": dict(GOVERNOR_CONFIG, enabled=False),
+        "NEIGHBOUR_LIST_CONFIG": dict(NEIGHBOUR_LIST_CONFIG, enabled=lists, **neighbour_config),
+        "PLANT_SCHEDULER_CONFIG": dict(PLANT_SCHEDULER_CONFIG, enabled=scheduler),
+    }
+    return Ecosystem(config, seed=seed)
+
+
+def brute_force_errors(ecosystem):
+    """Entries of the neighbour list that disagree with an all-pairs scan."""
+    neighbours = ecosystem.neighbours
+    cap = neighbours.max_competitors
+    errors = []
+    for organism in ecosystem.organisms:
+        if organism.species_config["diet"] == "Plant":
+            radius = organism.species_config["competition_radius"]
+            expected = sum(
+                1 for other in ecosystem.organisms
+                if other is not organism and other.species_config["diet"] == "Plant" and
+                ((organism.x - other.x) ** 2 + (organism.y - other.y) ** 2) ** 0.5 < radius
+            )
+            counted = neighbours.competitors(organism)
+            if counted != min(expected, cap):
+                errors.append((organism, counted, expected))
+            continue
+        candidates = set(neighbours.of(organism))
+        for other in ecosystem.organisms:
+            if other is organism:
+                continue
+            distance = ((organism.x - other.x) ** 2 + (organism.y - other.y) ** 2) ** 0.5
+            needed = ((other.species_name == organism.species_name and distance < MATING_RANGE) or
+                      (ecosystem._is_valid_prey(organism, other) and distance < PREDATION_RANGE))
+            if needed and other not in candidates:
+                errors.append((organism, other))
+    for organism, linked in neighbours._neighbours.items():
+        errors.extend((organism, other) for other in linked if organism not in neighbours._neighbours[other])
+    return errors
+
+
+def assert_no_errors(ecosystem):
+    assert brute_force_errors(ecosystem) == []
+
+
+def snapshot(ecosystem):
+    return [(organism.species_name, organism.x, organism.y, organism.energy, organism.health, organism.age)
+            for organism in ecosystem.organisms]
+
+
+def run(ecosystem, ticks, check=None):
+    for tick in range(ticks):
+        if tick == 20:
+            ecosystem.apply_input("spawn", "Wolf", 300, 100)
+        if tick == 40:
+            ecosystem.populate({"Grass": 100})
+        ecosystem.update()
+        if check and tick % 25 == 24:
+            check(ecosystem)
+
+
+@pytest.mark.parametrize("caps", [{}, SMALL_CAPS], ids=["default", "small-caps"])
+@pytest.mark.parametrize("scheduler", [False, True], ids=["ticked", "scheduled"])
+def test_lists_match_brute_force(caps, scheduler):
+    ecosystem = make_ecosystem(POPULATION, scheduler=scheduler, **caps)
+    assert_no_errors(ecosystem)
+    run(ecosystem, 100, check=assert_no_errors)
+
+
+# Capping competitor counts only leaves results unchanged while a capped plant loses all its energy anyway
+@pytest.mark.parametrize("caps", [{}, {"max_neighbours": SMALL_CAPS["max_neighbours"]}], ids=["default", "dense"])
+def test_lists_do_not_change_the_simulation(caps):
+    with_lists = make_ecosystem(POPULATION, **caps)
+    without_lists = make_ecosystem(POPULATION, lists=False, **caps)
+    run(with_lists, 100)
+    run(without_lists, 100)
+    assert snapshot(with_lists) == snapshot(without_lists)
+
+
+def test_saturated_stand_dying_off():
+    # Far more Grass than the ground row can feed: saturated counts fall below the cap, then most of it dies at once
+    ecosystem = make_ecosystem({}, max_competitors=100)
+    ecosystem.populate({"Grass": 3000})
+    assert ecosystem.neighbours._saturated.any()
+    for _ in range(12):
+        ecosystem.update()
+    assert len(ecosystem.organisms) < 1000
+    assert_no_errors(ecosystem)
\ No newline at end of file
@@ -0,0 +1,48 @@
+# tests/test_scenario.py
+import pytest
+
+from config import (WINDOW_CONFIG, SPECIES_CONFIG, GOVERNOR_CONFIG,
+                    NEIGHBOUR_LIST_CONFIG, PLANT_SCHEDULER_CONFIG)
+from simulation import Ecosystem, Scenario
+
+
+def load(data):
+    scenario = Scenario(data)
+    config = {
+        "WINDOW_CONFIG": WINDOW_CONFIG,
+        "SPECIES_CONFIG": scenario.species_config(SPECIES_CONFIG),
+        "INITIAL_POPULATION": {},
+        "GOVERNOR_CONFIG": scenario.governor_config(GOVERNOR_CONFIG),
+        "NEIGHBOUR_LIST_CONFIG": NEIGHBOUR_LIST_CONFIG,
+        "PLANT_SCHEDULER_CONFIG": PLANT_SCHEDULER_CONFIG,
+    }
+    ecosystem = Ecosystem(config, seed=scenario.seed)
+    return ecosystem, scenario.apply(ecosystem)
+
+
+def test_apply_spawns_populations_and_groups():
+    ecosystem, spawned = load({
+        "seed": 5,
+        "populations": {"Grass": 10},
+        "organisms": [
+            {"species": "Deer", "x": [100, 200], "y": [540, 550], "genetics": {"size_modifier": [1.1, 0.9]}},
+            {"species": ["Wolf", "Rabbit"], "x": [300, 400], "y": [540, 540]},
+        ],
+    })
+    assert len(spawned) == len(ecosystem.organisms) == 14
+    assert [organism.species_name for organism in spawned[10:]] == ["Deer", "Deer", "Wolf", "Rabbit"]
+    assert [organism.genetics.size_modifier for organism in spawned[10:12]] == [1.1, 0.9]
+
+
+@pytest.mark.parametrize("data, message", [
+    ({"populations": {"Unicorn": 3}}, "Unicorn"),
+    ({"organisms": [{"species": "Deer", "x": [1], "y": [540]},
+                    {"species": "Unicorn", "x": [1], "y": [540]}]}, "group 1"),
+    ({"organisms": [{"species": "Deer", "x": [1, 2], "y": [540]}]}, "group 0"),
+    ({"organisms": [{"species": ["Deer"], "x": [1, 2], "y": [540, 540]}]}, "group 0"),
+    ({"organisms": [{"species": "Deer", "x": [1, 2], "y": [540, 540],
+                     "genetics": {"speed_modifier": [1.0]}}]}, "group 0"),
+], ids=["population-species", "group-species", "y", "species-list", "genetics"])
+def test_apply_rejects_malformed_scenarios(data, message):
+    with pytest.raises(ValueError, match=message):
+        load(data)
\ No newline at end of file
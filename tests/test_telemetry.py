@@ -0,0 +1,41 @@
+# tests/test_telemetry.py
+import json
+import socket
+
+import pytest
+
+from config import TELEMETRY_CONFIG
+from simulation.telemetry import TelemetryServer
+
+
+@pytest.fixture
+def server():
+    server = TelemetryServer(dict(TELEMETRY_CONFIG, port=0), ["Grass", "Wolf"])
+    server.start()
+    yield server
+    server.stop()
+
+
+def send(server, command):
+    port = server._server.sockets[0].getsockname()[1]
+    with socket.create_connection((server.host, port), timeout=2) as connection:
+        connection.sendall(json.dumps(command).encode() + b"\n")
+        connection.shutdown(socket.SHUT_WR)
+        return connection.makefile().readline()
+
+
+@pytest.mark.parametrize("command", [
+    {"cmd": "spawn", "species": "Unicorn", "x": 300, "y": 540},
+    {"cmd": "spawn", "species": "Wolf", "x": float("inf"), "y": 540},
+    {"cmd": "speed", "value": None},
+    {"cmd": "launch"},
+], ids=["unknown-species", "infinite-x", "speed-value", "unknown-command"])
+def test_bad_commands_get_an_error_line(server, command):
+    assert "error" in json.loads(send(server, command))
+    assert server.drain_commands() == []
+
+
+def test_spawn_is_queued(server):
+    command = {"cmd": "spawn", "species": "Wolf", "x": 300, "y": None}
+    assert send(server, command) == ""
+    assert server.drain_commands() == [command]
\ No newline at end of file
@@ -1,4 +1,6 @@
 # visualization/__init__.py
 from .renderer import Renderer
+from .capture import FrameCapture
+from .frame_budget import FrameBudgetScheduler
 
-__all__ = ['Renderer']
\ No newline at end of file
+__all__ = ['Renderer', 'FrameCapture', 'FrameBudgetScheduler']
\ No newline at end of file
@@ -0,0 +1,135 @@
+# visualization/capture.py
+import functools
+import multiprocessing
+import os
+import queue
+import shutil
+import subprocess
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+
+import pygame
+
+# 编码进程中按名字缓存已挂载的共享内存
+_attached = {}
+
+
+def _warm_up():
+    # 编码进程启动时已导入pygame，这里什么都不用做
+    return None
+
+
+def _encode_png(name, size, path):
+    # 在编码进程中运行：pygame.image.save 压缩时持有GIL，放在独立进程里才不会拖慢模拟
+    shm = _attached.get(name)
+    if shm is None:
+        shm = _attached[name] = shared_memory.SharedMemory(name=name)
+    surface = pygame.image.frombuffer(shm.buf[:size[0] * size[1] * 4], size, "RGBX")
+    pygame.image.save(surface, path)
+
+
+class FrameCapture:
+    """离屏帧采集：帧缓冲池放在共享内存中，由后台进程池编码，模拟线程从不等待磁盘或压缩"""
+
+    def __init__(self, size, capture_config):
+        self.size = size
+        self.output_dir = capture_config["output_dir"]
+        self.every_n_ticks = max(1, capture_config["every_n_ticks"])
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        # 帧缓冲池：每个Surface直接建在一块共享内存上，渲染器画进去，提交时不拷贝像素，编码完成后再归还
+        self._slots = {}
+        self._free = queue.SimpleQueue()
+        for _ in range(max(1, capture_config["pool_size"])):
+            shm = shared_memory.SharedMemory(create=True, size=size[0] * size[1] * 4)
+            surface = pygame.image.frombuffer(shm.buf[:size[0] * size[1] * 4], size, "RGBX")
+            self._slots[surface] = shm
+            self._free.put(surface)
+
+        self.frames_written = 0
+        self.frames_dropped = 0
+        self._lock = threading.Lock()
+        self._pipe = None
+
+        encoder = capture_config["encoder"]
+        ffmpeg = shutil.which(capture_config["ffmpeg_path"]) if encoder == "ffmpeg" else None
+        if ffmpeg:
+            self._pipe = self._open_ffmpeg(ffmpeg, capture_config["fps"])
+            # 管道写入会释放GIL，且必须保持帧顺序，只用一个线程
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="capture")
+        else:
+            if encoder == "ffmpeg":
+                print("ffmpeg not found, falling back to PNG sequence")
+            # 用spawn启动编码进程，避免在已有遥测等线程的进程里fork
+            workers = max(1, capture_config["workers"])
+            self._executor = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            # 开始模拟前先把进程都启动好，否则最初的几十帧会因为缓冲池被占满而全部丢弃
+            for future in [self._executor.submit(_warm_up) for _ in range(workers)]:
+                future.result()
+
+    def _open_ffmpeg(self, ffmpeg, fps):
+        # 共享内存中的帧按字节顺序是 R, G, B, X
+        width, height = self.size
+        return subprocess.Popen(
+            [
+                ffmpeg, "-loglevel", "error", "-y",
+                "-f", "rawvideo", "-pix_fmt", "rgb0",
+                "-s", f"{width}x{height}", "-r", str(fps),
+                "-i", "-",
+                "-pix_fmt", "yuv420p",
+                os.path.join(self.output_dir, "capture.mp4"),
+            ],
+            stdin=subprocess.PIPE,
+        )
+
+    def wants(self, tick):
+        return tick % self.every_n_ticks == 0
+
+    def acquire(self):
+        """取一个空闲帧缓冲；池已耗尽时返回None，调用方应跳过这一帧"""
+        try:
+            return self._free.get_nowait()
+        except queue.Empty:
+            self.frames_dropped += 1
+            return None
+
+    def submit(self, surface, tick):
+        # 帧已经画在共享内存里，只把共享内存的名字交给编码进程
+        shm = self._slots[surface]
+        if self._pipe:
+            future = self._executor.submit(self._write_pipe, shm)
+        else:
+            path = os.path.join(self.output_dir, f"frame_{tick:08d}.png")
+            future = self._executor.submit(_encode_png, shm.name, self.size, path)
+        future.add_done_callback(functools.partial(self._finished, surface, tick))
+
+    def _write_pipe(self, shm):
+        self._pipe.stdin.write(shm.buf[:self.size[0] * self.size[1] * 4])
+
+    def _finished(self, surface, tick, future):
+        # 在执行器的回调线程中运行：统计结果并把帧缓冲归还给池
+        error = future.exception()
+        if error:
+            print(f"Frame {tick} capture failed: {error}")
+        else:
+            with self._lock:
+                self.frames_written += 1
+        self._free.put(surface)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        if self._pipe:
+            self._pipe.stdin.close()
+            self._pipe.wait()
+        # 先丢掉建在共享内存上的Surface（调用方也不能再持有），否则无法解除映射
+        shms = list(self._slots.values())
+        self._slots.clear()
+        self._free = queue.SimpleQueue()
+        for shm in shms:
+            shm.close()
+            shm.unlink()
+        print(f"Captured {self.frames_written} frames to {self.output_dir} "
+              f"({self.frames_dropped} dropped)")
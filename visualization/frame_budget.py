@@ -0,0 +1,60 @@
+# visualization/frame_budget.py
+
+# 细节等级，按削减顺序递增；每一级都包含前面各级的削减
+LOD_FULL = 0
+LOD_NO_PARTICLES = 1   # 关闭粒子效果
+LOD_NO_BOBBING = 2     # 关闭上下浮动动画
+LOD_SKIP_FRAMES = 3    # 每隔几帧才渲染一次
+LOD_PLANT_TILES = 4    # 植物按网格聚合绘制
+LOD_LEVELS = ("full", "no particles", "no bobbing", "skip frames", "plant tiles")
+
+
+class FrameBudgetScheduler:
+    """帧时间预算调度：超预算时逐级降低细节，有余量时再逐级恢复"""
+
+    def __init__(self, fps, budget_config):
+        self.enabled = budget_config["enabled"]
+        self.budget_ms = 1000.0 / fps
+        self.degrade_ratio = budget_config["degrade_ratio"]
+        self.recover_ratio = budget_config["recover_ratio"]
+        self.degrade_frames = budget_config["degrade_frames"]
+        self.recover_frames = budget_config["recover_frames"]
+        self.smoothing = budget_config["smoothing"]
+        self.render_every = budget_config["render_every"]
+
+        self.level = LOD_FULL
+        self.average_ms = 0.0
+        self.frame = 0
+        self._over = 0
+        self._under = 0
+
+    def record(self, frame_ms):
+        """记录一帧的实际耗时（不含等待时间），必要时调整细节等级"""
+        self.frame += 1
+        if not self.enabled:
+            return
+        # 指数平滑，避免单帧抖动引起等级跳变
+        self.average_ms += (frame_ms - self.average_ms) * self.smoothing
+
+        if self.average_ms > self.budget_ms * self.degrade_ratio:
+            self._over += 1
+            self._under = 0
+        elif self.average_ms < self.budget_ms * self.recover_ratio:
+            self._under += 1
+            self._over = 0
+        else:
+            self._over = self._under = 0
+
+        if self._over >= self.degrade_frames and self.level < LOD_PLANT_TILES:
+            self.level += 1
+            self._over = 0
+            print(f"Frame budget exceeded ({self.average_ms:.1f}ms), detail: {LOD_LEVELS[self.level]}")
+        elif self._under >= self.recover_frames and self.level > LOD_FULL:
+            self.level -= 1
+            self._under = 0
+            print(f"Frame budget recovered ({self.average_ms:.1f}ms), detail: {LOD_LEVELS[self.level]}")
+
+    def should_render(self):
+        if self.level < LOD_SKIP_FRAMES:
+            return True
+        return self.frame % self.render_every == 0
@@ -3,11 +3,14 @@ import pygame
 import math
 import random
 from typing import Dict, List
+from .frame_budget import LOD_FULL, LOD_NO_PARTICLES, LOD_NO_BOBBING, LOD_PLANT_TILES
 
 class Renderer:
-    def __init__(self, screen, config):
+    def __init__(self, screen, config, seed=None):
         self.screen = screen
         self.config = config
+        # 渲染器自己的随机数流（云、山、花、粒子），不影响模拟
+        self.rng = random.Random(seed)
         # 使用更好看的字体
         try:
             self.font = pygame.font.Font("assets/fonts/Roboto-Bold.ttf", 36)
@@ -30,13 +33,26 @@ class Renderer:
         
         # 粒子系统
         self.particles = []
+
+        # 细节等级，由FrameBudgetScheduler根据帧耗时设置
+        self.detail_level = LOD_FULL
+        self.plant_tile_size = 20
+
+        # 基因性状分布面板，显示的性状名（None表示不显示）
+        self.trait_panel = None
+        self.trait_rect = pygame.Rect(
+            self.graph_rect.left,
+            self.graph_rect.top - self.graph_rect.height - 10,
+            self.graph_rect.width,
+            self.graph_rect.height
+        )
         
     def _create_clouds(self):
         clouds = []
         for _ in range(5):
-            x = random.randint(0, self.config["WINDOW_CONFIG"]["width"])
-            y = random.randint(0, 200)
-            speed = random.uniform(0.2, 0.5)
+            x = self.rng.randint(0, self.config["WINDOW_CONFIG"]["width"])
+            y = self.rng.randint(0, 200)
+            speed = self.rng.uniform(0.2, 0.5)
             clouds.append({"x": x, "y": y, "speed": speed})
         return clouds
 
@@ -73,7 +89,7 @@ class Renderer:
         
         # 生成山脉轮廓
         for x in range(0, width + 50, 50):
-            y = height * 0.7 - random.randint(50, 150)
+            y = height * 0.7 - self.rng.randint(50, 150)
             points.append((x, y))
         points.append((width, height * 0.7))
         
@@ -91,9 +107,9 @@ class Renderer:
         
         # 添加随机的小花
         for _ in range(100):
-            x = random.randint(0, width)
-            y = random.randint(int(height * 0.7), height)
-            color = random.choice([
+            x = self.rng.randint(0, width)
+            y = self.rng.randint(int(height * 0.7), height)
+            color = self.rng.choice([
                 (255, 192, 203),  # 粉色
                 (255, 255, 0),    # 黄色
                 (255, 0, 0),      # 红色
@@ -107,7 +123,7 @@ class Renderer:
             cloud["x"] += cloud["speed"]
             if cloud["x"] > width + 100:
                 cloud["x"] = -100
-                cloud["y"] = random.randint(0, 200)
+                cloud["y"] = self.rng.randint(0, 200)
 
     def _draw_cloud(self, surface, x, y):
         color = (255, 255, 255, 150)
@@ -119,8 +135,8 @@ class Renderer:
         self.particles.append({
             "x": x,
             "y": y,
-            "dx": random.uniform(-1, 1),
-            "dy": random.uniform(-2, 0),
+            "dx": self.rng.uniform(-1, 1),
+            "dy": self.rng.uniform(-2, 0),
             "life": 30,
             "color": color
         })
@@ -133,7 +149,21 @@ class Renderer:
             if particle["life"] <= 0:
                 self.particles.remove(particle)
 
-    def render(self, ecosystem):
+    def render(self, ecosystem, target=None):
+        # 离屏模式下画到指定的Surface上，不刷新窗口
+        if target is not None:
+            display = self.screen
+            self.screen = target
+            try:
+                self._draw_frame(ecosystem)
+            finally:
+                self.screen = display
+            return
+
+        self._draw_frame(ecosystem)
+        pygame.display.flip()
+
+    def _draw_frame(self, ecosystem):
         # 更新动画
         self.animation_timer = (self.animation_timer + 1) % 360
         self._update_clouds()
@@ -153,11 +183,18 @@ class Renderer:
         self.screen.blit(cloud_surface, (0, 0))
         
         # 绘制生物（按Y坐标排序）
-        sorted_organisms = sorted(ecosystem.organisms, key=lambda x: x.y)
+        organisms = ecosystem.organisms
+        if self.detail_level >= LOD_PLANT_TILES:
+            # 植物聚合成网格块绘制，只逐个绘制动物
+            self._render_plant_tiles([org for org in organisms if org.species_config["diet"] == "Plant"])
+            organisms = [org for org in organisms if org.species_config["diet"] != "Plant"]
+        sorted_organisms = sorted(organisms, key=lambda x: x.y)
         for org in sorted_organisms:
             self._render_organism(org)
             
         # 绘制粒子
+        if self.detail_level >= LOD_NO_PARTICLES:
+            self.particles.clear()
         for particle in self.particles:
             alpha = int(255 * (particle["life"] / 30))
             color = (*particle["color"][:3], alpha)
@@ -170,15 +207,15 @@ class Renderer:
         
         # 绘制UI
         self._render_ui(ecosystem)
-        
-        pygame.display.flip()
 
     def _render_organism(self, org):
         size = int(org.species_config["size"] * org.genetics.size_modifier)
         base_color = org.species_config["color"]
         
         # 添加简单的动画效果
-        if org.species_config["diet"] != "Plant":
+        if self.detail_level >= LOD_NO_BOBBING:
+            offset_y = 0
+        elif org.species_config["diet"] != "Plant":
             offset_y = math.sin(self.animation_timer * 0.1 + org.x * 0.1) * 2
         else:
             offset_y = math.sin(self.animation_timer * 0.05 + org.x * 0.1) * 1
@@ -198,9 +235,24 @@ class Renderer:
         self.screen.blit(surface, pos)
         
         # 添加粒子效果
-        if random.random() < 0.1:
+        if self.detail_level < LOD_NO_PARTICLES and self.rng.random() < 0.1:
             self._add_particle(org.x, org.y, org.species_config["color"])
 
+    def _render_plant_tiles(self, plants):
+        """把植物按网格聚合，每格只画一个色块，高度随数量增加"""
+        tile = self.plant_tile_size
+        tiles = {}
+        for org in plants:
+            key = (int(org.x) // tile, int(org.y) // tile)
+            if key in tiles:
+                tiles[key][0] += 1
+            else:
+                tiles[key] = [1, org.species_config["color"]]
+
+        for (tx, ty), (count, color) in tiles.items():
+            height = min(tile * 2, 4 + count * 2)
+            pygame.draw.rect(self.screen, color, (tx * tile, (ty + 1) * tile - height, tile - 1, height))
+
     def _draw_organism(self, x, y, size, color, species_type):
         """绘制更详细的生物图形"""
         surface = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
@@ -260,6 +312,54 @@ class Renderer:
         self._render_statistics(ecosystem.statistics)
         self._render_graph(ecosystem.statistics)
 
+        if self.trait_panel:
+            self._render_trait_panel(ecosystem)
+
+        # 内存分析调试面板
+        if ecosystem.memory_profiler and ecosystem.memory_profiler.latest:
+            self._render_memory_overlay(ecosystem.memory_profiler)
+
+    def _render_trait_panel(self, ecosystem):
+        """按物种绘制所选基因性状的分布（每个物种各自归一化）"""
+        pygame.draw.rect(self.screen, (240, 240, 240), self.trait_rect)
+        pygame.draw.rect(self.screen, (200, 200, 200), self.trait_rect, 2)
+        title = self.small_font.render(self.trait_panel, True, (0, 0, 0))
+        self.screen.blit(title, (self.trait_rect.left + 5, self.trait_rect.top + 3))
+
+        plot_top = self.trait_rect.top + 25
+        plot_height = self.trait_rect.bottom - plot_top - 5
+        for species_name, histograms in ecosystem.traits.histograms.items():
+            counts = histograms[self.trait_panel].counts
+            peak = max(counts)
+            if peak == 0:
+                continue
+            step = self.trait_rect.width / (len(counts) - 1)
+            points = [
+                (int(self.trait_rect.left + i * step), int(plot_top + plot_height * (1 - count / peak)))
+                for i, count in enumerate(counts)
+            ]
+            color = ecosystem.config["SPECIES_CONFIG"][species_name]["color"]
+            pygame.draw.lines(self.screen, color, False, points, 2)
+
+    def _render_memory_overlay(self, profiler):
+        record = profiler.latest
+        lines = [
+            f"Traced: {record['traced_bytes'] / 1048576:.1f} MB",
+            f"Peak RSS: {record['peak_rss_kb'] / 1024:.1f} MB" if record["peak_rss_kb"] else "Peak RSS: n/a",
+            f"Bytes/organism (last bulk spawn): {record['bytes_per_organism_at_spawn'] or '-'}",
+            f"GC gen0/1/2: {'/'.join(str(n) for n in record['gc_collections'])}"
+            f" ({record['gc_pause_ms']:.2f} ms, total {profiler.gc_total_pause_ms:.0f} ms)"
+        ]
+        for name, phase in record["phases"].items():
+            lines.append(f"{name}: {phase['peak_growth'] / 1024:.1f} KB peak, {phase['net'] / 1024:+.1f} KB net")
+
+        height = 10 + len(lines) * 20
+        overlay = pygame.Surface((360, height), pygame.SRCALPHA)
+        pygame.draw.rect(overlay, (0, 0, 0, 160), overlay.get_rect())
+        for i, text in enumerate(lines):
+            overlay.blit(self.small_font.render(text, True, (255, 255, 0)), (8, 5 + i * 20))
+        self.screen.blit(overlay, (10, self.config["WINDOW_CONFIG"]["height"] - height - 10))
+
     def _render_statistics(self, statistics):
         y_pos = 10
         colors = {